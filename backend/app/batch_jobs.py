@@ -0,0 +1,164 @@
+import os
+import sys
+import io
+import asyncio
+import logging
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+import orjson
+from sqlalchemy import select, delete
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+# Add current directory to path for imports
+current_dir = Path(__file__).parent
+sys.path.insert(0, str(current_dir))
+
+from db import SessionLocal, reserve_message_orders
+from models import ChatSession, ChatMessage, ChatBatch
+from openai_chat import client, build_chat_messages, route_chat_request
+from schemas import ChatRequest
+
+logger = logging.getLogger(__name__)
+logger.setLevel(os.getenv("LOG_LEVEL", "INFO"))
+
+# How often submitted batches are checked - results can take up to the 24h completion window
+BATCH_POLL_INTERVAL_SECONDS = int(os.getenv("BATCH_POLL_INTERVAL_SECONDS", "300"))
+
+# Batches that ended without producing any more results
+BATCH_FINISHED_STATUSES = frozenset({"completed", "failed", "expired", "cancelled"})
+
+async def submit_chat_batch(requests: List[Dict[str, Any]]) -> str:
+    """
+    Submit chat completions to the OpenAI Batch API and return the batch ID.
+    Each request needs a unique custom_id plus messages, model and max_tokens.
+    """
+    buffer = io.BytesIO()
+    for request in requests:
+        buffer.write(orjson.dumps({
+            "custom_id": request["custom_id"],
+            "method": "POST",
+            "url": "/v1/chat/completions",
+            "body": {
+                "model": request["model"],
+                "messages": request["messages"],
+                "max_tokens": request["max_tokens"]
+            }
+        }))
+        buffer.write(b"\n")
+
+    batch_file = await client.files.create(file=("chat_batch.jsonl", buffer.getvalue()), purpose="batch")
+    batch = await client.batches.create(
+        input_file_id=batch_file.id,
+        endpoint="/v1/chat/completions",
+        completion_window="24h"
+    )
+    logger.info("Submitted chat batch %s with %d requests", batch.id, len(requests))
+    return batch.id
+
+async def submit_chat_requests(chat_requests: List[ChatRequest]) -> str:
+    """
+    Submit chat requests for offline answering; replies are saved to their sessions once the batch finishes
+    """
+    batch_requests = []
+    for request in chat_requests:
+        model, max_tokens = route_chat_request(request.message, request.model_override)
+        batch_requests.append({
+            "custom_id": request.session_id,
+            "messages": build_chat_messages(request.message, request.resume_data, request.chat_history),
+            "model": model,
+            "max_tokens": max_tokens
+        })
+
+    batch_id = await submit_chat_batch(batch_requests)
+    
+    # Kept in the database so a restart, or another worker, can still collect the results
+    async with SessionLocal() as db:
+        db.add(ChatBatch(batch_id=batch_id, requests={
+            request.session_id: {"message": request.message, "resume_id": request.resume_id}
+            for request in chat_requests
+        }))
+        await db.commit()
+    return batch_id
+
+async def fetch_batch_results(batch_id: str) -> Optional[Dict[str, str]]:
+    """
+    Replies of a finished batch by custom_id, or None while it is still running
+    """
+    batch = await client.batches.retrieve(batch_id)
+    if batch.status not in BATCH_FINISHED_STATUSES:
+        return None
+    if batch.status != "completed":
+        logger.info("Chat batch %s ended with status %s", batch_id, batch.status)
+    if not batch.output_file_id:
+        return {}
+
+    output = await client.files.content(batch.output_file_id)
+    results = {}
+    for line in output.content.splitlines():
+        if not line.strip():
+            continue
+        result = orjson.loads(line)
+        response = result.get("response") or {}
+        if result.get("error") or response.get("status_code") != 200:
+            logger.warning("Chat batch %s request %s failed", batch_id, result.get("custom_id"))
+            continue
+        results[result["custom_id"]] = response["body"]["choices"][0]["message"]["content"]
+    return results
+
+async def save_batch_results(batch_id: str, requests: Dict[str, Dict[str, Any]], results: Dict[str, str]) -> bool:
+    """
+    Store each batch reply as a new turn in its chat session, unless another worker already has.
+    Deleting the pending batch in the same transaction claims it, so replies are saved once.
+    """
+    async with SessionLocal() as db:
+        claimed = await db.execute(delete(ChatBatch).where(ChatBatch.batch_id == batch_id))
+        if claimed.rowcount == 0:
+            await db.rollback()
+            return False
+        
+        for session_id, response in results.items():
+            request = requests.get(session_id)
+            if request is None:
+                continue
+
+            session_exists = (await db.execute(
+                select(ChatSession.id).where(ChatSession.session_id == session_id)
+            )).first()
+            if not session_exists:
+                db.add(ChatSession(session_id=session_id, resume_id=request["resume_id"], message_count=2))
+                next_order = 1
+            else:
+                next_order = await reserve_message_orders(db, session_id)
+            db.add_all([
+                ChatMessage(session_id=session_id, role="user", content=request["message"], message_order=next_order),
+                ChatMessage(session_id=session_id, role="assistant", content=response, message_order=next_order + 1)
+            ])
+        await db.commit()
+    return True
+
+async def poll_chat_batches():
+    """
+    Check submitted batches periodically and save the replies of finished ones
+    """
+    while True:
+        await asyncio.sleep(BATCH_POLL_INTERVAL_SECONDS)
+        try:
+            async with SessionLocal() as db:
+                pending = (await db.execute(select(ChatBatch.batch_id, ChatBatch.requests))).all()
+        except Exception as e:
+            logger.warning("Could not load pending chat batches: %s", e)
+            continue
+        
+        for batch_id, requests in pending:
+            try:
+                results = await fetch_batch_results(batch_id)
+                if results is None:
+                    continue
+                if await save_batch_results(batch_id, requests, results):
+                    logger.info("Saved %d replies from chat batch %s", len(results), batch_id)
+            except Exception as e:
+                logger.warning("Chat batch %s check failed: %s", batch_id, e)
@@ -1,10 +1,16 @@
 import os
 import sys
-import tempfile
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, Any, List, Tuple
-import json
-import PyPDF2
+from typing import Dict, Any, List, Tuple, Union
+import re
+import time
+import hashlib
+import ahocorasick
+import orjson
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -14,110 +20,383 @@ load_dotenv()
 current_dir = Path(__file__).parent
 sys.path.insert(0, str(current_dir))
 
-import openai
-from openai import OpenAI
+from status_store import StatusStore
+# One pooled OpenAI client and retry policy for every call the app makes
+from openai_chat import create_chat_completion
 
-# Initialize OpenAI client
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+logger = logging.getLogger(__name__)
+logger.setLevel(os.getenv("LOG_LEVEL", "INFO"))
 
-def extract_text_from_pdf(file_content: bytes) -> str:
+# After a quota/rate-limit failure, skip OpenAI entirely for this many seconds
+OPENAI_COOLDOWN_SECONDS = 60
+openai_disabled_until = 0.0
+
+# Error messages that indicate quota/billing issues
+OPENAI_QUOTA_ERROR_RE = re.compile(
+    r"quota|billing|rate[_ ]?limit|exceeded|usage|credits|payment|\b429\b",
+    re.IGNORECASE
+)
+
+# Static instructions for job description parsing. This must stay byte-identical
+# between calls (no interpolation) and come before the job text so OpenAI can
+# reuse the cached prompt prefix, which only kicks in past ~1024 tokens - the
+# worked examples below keep it over that threshold.
+JOB_PARSER_SYSTEM_PROMPT = """You are an expert at parsing job descriptions and extracting structured information. Always return valid JSON.
+
+The user message contains the full text of a single job description, usually extracted from a PDF. Parse it and return a JSON object with exactly the following structure:
+{
+    "job_title": "extracted job title",
+    "company": "company name if mentioned",
+    "required_skills": ["skill1", "skill2", "skill3"],
+    "preferred_skills": ["preferred_skill1", "preferred_skill2"],
+    "experience_level": "entry/mid/senior level",
+    "description": "brief summary of the role",
+    "responsibilities": ["responsibility1", "responsibility2"],
+    "qualifications": ["qualification1", "qualification2"]
+}
+
+Field guidance:
+- job_title: the title of the advertised position as written, without location or seniority codes such as "(m/f/d)" or "REQ-1234".
+- company: the hiring company. Use an empty string if no company is named; never guess.
+- required_skills: skills the posting marks as required, must-have, or lists under "Requirements", "What you need", "Minimum qualifications" and similar headings.
+- preferred_skills: skills marked as preferred, nice-to-have, bonus, a plus, or listed under "Preferred qualifications". A skill must not appear in both lists; if in doubt, treat it as required.
+- experience_level: one of "entry", "mid", "senior" or "lead", inferred from the title and the number of years of experience requested (0-2 years entry, 3-5 mid, 6+ senior, people management lead).
+- description: two or three sentences summarising the role in plain language.
+- responsibilities: the main duties of the role, one short sentence each, at most eight items.
+- qualifications: non-skill requirements such as degrees, years of experience, certifications, work authorisation or language requirements, at most eight items.
+
+Skill extraction rules:
+- Focus on extracting technical skills, programming languages, frameworks, tools, and relevant technologies.
+- Categories to look for: programming languages (Python, Java, TypeScript, Go), frontend frameworks (React, Angular, Vue.js), backend frameworks (Django, Flask, FastAPI, Spring Boot, Express.js), databases (PostgreSQL, MySQL, MongoDB, Redis), cloud platforms (AWS, Azure, Google Cloud), infrastructure and DevOps tools (Docker, Kubernetes, Terraform, Jenkins, CI/CD), data and ML tooling (Pandas, Spark, TensorFlow, PyTorch), and API styles (REST APIs, GraphQL, gRPC).
+- Use the canonical product name for each skill ("PostgreSQL" not "postgres", "Node.js" not "node", "Google Cloud" not "GCP").
+- Each skill is a short noun phrase of one to four words. Split combined phrases such as "Python/Django" into separate skills.
+- Do not include soft skills ("communication", "teamwork") in the skill lists; put them in qualifications if they are explicitly required.
+- Do not repeat a skill within a list.
+
+Example input:
+Senior Backend Engineer - Acme Analytics
+We are looking for a senior engineer with 6+ years of experience building APIs in Python. You will design FastAPI services, own our PostgreSQL schema and deploy to AWS with Docker and Terraform. Experience with Kafka or GraphQL is a plus. BSc in Computer Science or equivalent.
+
+Example output:
+{
+    "job_title": "Senior Backend Engineer",
+    "company": "Acme Analytics",
+    "required_skills": ["Python", "FastAPI", "PostgreSQL", "AWS", "Docker", "Terraform"],
+    "preferred_skills": ["Kafka", "GraphQL"],
+    "experience_level": "senior",
+    "description": "Senior backend role building Python APIs on AWS. The engineer owns service design and the PostgreSQL data model.",
+    "responsibilities": ["Design and build FastAPI services", "Own the PostgreSQL schema", "Deploy services to AWS using Docker and Terraform"],
+    "qualifications": ["6+ years of experience building APIs", "BSc in Computer Science or equivalent"]
+}
+
+Example input:
+Junior Frontend Developer
+Join our product team to build customer-facing dashboards. Must know JavaScript, HTML and CSS and have used React in at least one project. TypeScript and Jest experience would be nice to have. Fluent English required.
+
+Example output:
+{
+    "job_title": "Junior Frontend Developer",
+    "company": "",
+    "required_skills": ["JavaScript", "HTML", "CSS", "React"],
+    "preferred_skills": ["TypeScript", "Jest"],
+    "experience_level": "entry",
+    "description": "Entry-level frontend role on a product team building customer-facing dashboards in React.",
+    "responsibilities": ["Build customer-facing dashboards"],
+    "qualifications": ["Fluent English"]
+}
+
+Return only the JSON object, no additional text."""
+
+# Appended after the shared system prompt when several job descriptions are parsed in one call
+JOB_PARSER_BATCH_INSTRUCTIONS = """This request contains several job descriptions. The user message is a JSON array of objects of the form {"id": <number>, "text": "<job description>"}. Parse every job description independently using the structure and rules above and return a JSON object of the form {"results": [...]} with exactly one entry per input. Each entry is the parsed object for one job description with an additional "id" field copied from the input."""
+
+# Stable routing key so repeated calls land on a server holding the cached prefix
+JOB_PARSER_PROMPT_CACHE_KEY = hashlib.sha256(JOB_PARSER_SYSTEM_PROMPT.encode()).hexdigest()[:32]
+
+# Parsed job descriptions keyed by SHA-256 of the extracted text, kept for a day. Stored in Redis
+# when REDIS_URL is set so every worker shares the hits; otherwise in process memory, where the
+# least recently used entries are evicted so unique uploads don't accumulate.
+JOB_PARSE_CACHE_TTL = 24 * 60 * 60
+JOB_PARSE_CACHE_MAX_ENTRIES = int(os.getenv("JOB_PARSE_CACHE_MAX_ENTRIES", "1024"))
+job_parse_cache = StatusStore("job_parse", ttl=JOB_PARSE_CACHE_TTL, max_entries=JOB_PARSE_CACHE_MAX_ENTRIES)
+
+# Upper bound on pages read from a single job description PDF
+MAX_PDF_PAGES = 200
+
+def extract_text_from_pdf(source: Union[bytes, str]) -> str:
     """
-    Extract text content from PDF file
+    Extract text content from PDF bytes or a PDF file path
     """
+    import fitz  # PyMuPDF, imported on first use so start-up doesn't pay for it
+    
     try:
-        # Create a temporary file
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as temp_file:
-            temp_file.write(file_content)
-            temp_file_path = temp_file.name
-        
-        # Extract text using PyPDF2
-        text = ""
-        with open(temp_file_path, 'rb') as file:
-            pdf_reader = PyPDF2.PdfReader(file)
-            for page in pdf_reader.pages:
-                text += page.extract_text() + "\n"
-        
-        # Clean up temp file
-        os.unlink(temp_file_path)
+        # Uploads saved to disk are opened by path; raw bytes are read straight from memory
+        if isinstance(source, str):
+            doc = fitz.open(source, filetype="pdf")
+        else:
+            doc = fitz.open(stream=source, filetype="pdf")
+        try:
+            # Page count is known up front, so size the list once and fill by index
+            page_count = min(doc.page_count, MAX_PDF_PAGES)
+            parts = [""] * page_count
+            for page_number in range(page_count):
+                page = doc[page_number]
+                # A page without fonts is a scanned image - skip decoding its content
+                if not page.get_fonts():
+                    continue
+                parts[page_number] = page.get_text("text")
+        finally:
+            doc.close()
         
-        return text.strip()
+        return "\n".join(part for part in parts if part).strip()
     except Exception as e:
-        print(f"Error extracting text from PDF: {e}")
+        logger.warning("Error extracting text from PDF: %s", e)
         return ""
 
-async def parse_job_description_with_openai(job_text: str) -> Dict[str, Any]:
+# PDFs above this size are parsed in a worker process instead of a thread
+LARGE_PDF_BYTES = 50 * 1024 * 1024
+
+# Worker processes for large PDFs, started on first use. They are spawned rather than forked,
+# so they don't inherit the server's event loop, threads or database connections.
+PDF_PROCESS_WORKERS = int(os.getenv("PDF_PROCESS_WORKERS", "2"))
+pdf_process_pool = None
+
+def get_pdf_process_pool() -> ProcessPoolExecutor:
     """
-    Parse job description text using OpenAI to extract structured information
+    Get the pool of PDF worker processes, starting it on first use
     """
+    global pdf_process_pool
+    if pdf_process_pool is None:
+        pdf_process_pool = ProcessPoolExecutor(
+            max_workers=PDF_PROCESS_WORKERS,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+    return pdf_process_pool
+
+def shutdown_pdf_process_pool():
+    """
+    Stop the PDF worker processes, dropping work that hasn't started
+    """
+    global pdf_process_pool
+    if pdf_process_pool is not None:
+        pdf_process_pool.shutdown(wait=True, cancel_futures=True)
+        pdf_process_pool = None
+
+async def extract_text_from_pdf_async(source: Union[bytes, str]) -> str:
+    """
+    Extract PDF text off the event loop - in a thread, or a worker process for very large files
+    """
+    size = os.path.getsize(source) if isinstance(source, str) else len(source)
+    if size > LARGE_PDF_BYTES:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(get_pdf_process_pool(), extract_text_from_pdf, source)
     
-    if not client.api_key:
-        print("❌ OpenAI API key not found")
-        print("🔄 Using mock job analysis...")
-        return generate_mock_job_analysis(job_text)
-    
-    prompt = f"""
-    Parse the following job description and extract structured information in JSON format.
+    return await asyncio.to_thread(extract_text_from_pdf, source)
+
+async def get_cached_job_data(cache_key: str):
+    """
+    Return cached job data for a text hash, or None if it was never cached, has expired or the cache is unreachable
+    """
+    try:
+        return await job_parse_cache.get(cache_key)
+    except Exception as e:
+        logger.warning("Job parse cache read failed: %s", e)
+        return None
+
+async def cache_job_data(cache_key: str, job_data: Dict[str, Any]):
+    """
+    Remember parsed job data for a text hash - a cache that can't be written is only logged
+    """
+    try:
+        await job_parse_cache.set(cache_key, job_data)
+    except Exception as e:
+        logger.warning("Job parse cache write failed: %s", e)
+
+async def parse_job_description_with_openai(job_text: str, no_cache: bool = False) -> Dict[str, Any]:
+    """
+    Parse job description text using OpenAI to extract structured information
+    """
+    global openai_disabled_until
     
-    Job Description:
-    {job_text}
+    cache_key = hashlib.sha256(job_text.encode()).hexdigest()
+    if not no_cache:
+        cached = await get_cached_job_data(cache_key)
+        if cached is not None:
+            logger.info("Job description served from cache")
+            return cached
     
-    Please extract and return a JSON object with the following structure:
-    {{
-        "job_title": "extracted job title",
-        "company": "company name if mentioned",
-        "required_skills": ["skill1", "skill2", "skill3"],
-        "preferred_skills": ["preferred_skill1", "preferred_skill2"],
-        "experience_level": "entry/mid/senior level",
-        "description": "brief summary of the role",
-        "responsibilities": ["responsibility1", "responsibility2"],
-        "qualifications": ["qualification1", "qualification2"]
-    }}
+    if not os.getenv("OPENAI_API_KEY"):
+        logger.warning("OpenAI API key not found, using mock job analysis")
+        return generate_mock_job_analysis(job_text)
     
-    Focus on extracting technical skills, programming languages, frameworks, tools, and relevant technologies.
-    Return only the JSON object, no additional text.
-    """
+    if time.monotonic() < openai_disabled_until:
+        logger.info("OpenAI cooling down after a quota error, using mock job analysis")
+        return generate_mock_job_analysis(job_text)
     
     try:
-        response = client.chat.completions.create(
-            model="gpt-3.5-turbo",
+        response = await create_chat_completion(
+            model="gpt-4o-mini",
             messages=[
-                {
-                    "role": "system", 
-                    "content": "You are an expert at parsing job descriptions and extracting structured information. Always return valid JSON."
-                },
-                {"role": "user", "content": prompt}
+                {"role": "system", "content": JOB_PARSER_SYSTEM_PROMPT},
+                {"role": "user", "content": job_text}
             ],
-            temperature=0.3,
-            max_tokens=1500
+            response_format={"type": "json_object"},
+            temperature=0,
+            max_tokens=600,
+            extra_body={"prompt_cache_key": JOB_PARSER_PROMPT_CACHE_KEY}
         )
         
-        # Parse the JSON response
-        job_data = json.loads(response.choices[0].message.content)
+        # JSON mode guarantees a syntactically valid object; a truncated
+        # response still lands in the generic handler below
+        job_data = orjson.loads(response.choices[0].message.content)
         
-        print(f"✅ Job description parsed successfully using OpenAI")
+        logger.info("Job description parsed using OpenAI")
+        await cache_job_data(cache_key, job_data)
         return job_data
         
-    except json.JSONDecodeError as e:
-        print(f"❌ Error parsing OpenAI JSON response: {e}")
-        print("🔄 Falling back to mock job analysis...")
-        return generate_mock_job_analysis(job_text)
     except Exception as e:
         error_str = str(e)
-        print(f"❌ Error calling OpenAI API: {e}")
-        print(f"🔍 Error type: {type(e)}")
-        print(f"🔍 Error string: {error_str}")
+        logger.warning("Error calling OpenAI API (%s): %s", type(e).__name__, error_str)
         
         # Check for specific OpenAI errors that indicate quota/billing issues
-        if any(keyword in error_str.lower() for keyword in [
-            "quota", "billing", "insufficient_quota", "rate_limit", 
-            "exceeded", "usage", "credits", "payment", "429", "error code: 429"
-        ]):
-            print("🔄 OpenAI quota/billing issue detected. Using mock analysis...")
+        if OPENAI_QUOTA_ERROR_RE.search(error_str):
+            logger.warning("OpenAI quota/billing issue detected, using mock job analysis")
+            openai_disabled_until = time.monotonic() + OPENAI_COOLDOWN_SECONDS
             return generate_mock_job_analysis(job_text)
         else:
-            print("🔄 OpenAI API error. Falling back to mock analysis...")
+            logger.warning("Falling back to mock job analysis")
             return generate_mock_job_analysis(job_text)
 
+# Job descriptions sent together in one OpenAI call, and the reply budget for each of them
+JOB_PARSE_BATCH_SIZE = int(os.getenv("JOB_PARSE_BATCH_SIZE", "8"))
+JOB_PARSE_TOKENS_PER_JOB = 600
+
+# gpt-4o-mini's output token limit - no batch asks for more than this
+JOB_PARSE_MAX_OUTPUT_TOKENS = 16384
+
+async def parse_job_descriptions_group(job_texts: List[str], positions: List[int], cache_keys: List[str]) -> Dict[int, Dict[str, Any]]:
+    """
+    Parse the job descriptions at positions with a single OpenAI call, returning job data by position
+    """
+    global openai_disabled_until
+    
+    parsed = {}
+    try:
+        response = await create_chat_completion(
+            model="gpt-4o-mini",
+            messages=[
+                {"role": "system", "content": JOB_PARSER_SYSTEM_PROMPT},
+                {"role": "system", "content": JOB_PARSER_BATCH_INSTRUCTIONS},
+                {"role": "user", "content": orjson.dumps(
+                    [{"id": position, "text": job_texts[position]} for position in positions]
+                ).decode()}
+            ],
+            response_format={"type": "json_object"},
+            temperature=0,
+            max_tokens=min(JOB_PARSE_TOKENS_PER_JOB * len(positions), JOB_PARSE_MAX_OUTPUT_TOKENS),
+            extra_body={"prompt_cache_key": JOB_PARSER_PROMPT_CACHE_KEY}
+        )
+        
+        batch_data = orjson.loads(response.choices[0].message.content)
+        entries = batch_data.get("results") if isinstance(batch_data, dict) else None
+        for job_data in entries if isinstance(entries, list) else []:
+            # The id is echoed by the model, so it may come back as a string or not at all
+            if not isinstance(job_data, dict):
+                continue
+            try:
+                position = int(job_data.pop("id"))
+            except (KeyError, TypeError, ValueError):
+                continue
+            if position in positions and position not in parsed:
+                parsed[position] = job_data
+                await cache_job_data(cache_keys[position], job_data)
+        
+        logger.info("Parsed %d of %d job descriptions in one OpenAI call", len(parsed), len(positions))
+        
+    except Exception as e:
+        logger.warning("Error calling OpenAI API for batch: %s", e)
+        if OPENAI_QUOTA_ERROR_RE.search(str(e)):
+            openai_disabled_until = time.monotonic() + OPENAI_COOLDOWN_SECONDS
+    
+    return parsed
+
+async def parse_job_descriptions_batch(job_texts: List[str], no_cache: bool = False) -> List[Dict[str, Any]]:
+    """
+    Parse several job descriptions with as few OpenAI calls as possible, in input order
+    """
+    results = [None] * len(job_texts)
+    cache_keys = [hashlib.sha256(job_text.encode()).hexdigest() for job_text in job_texts]
+    
+    # Serve what we can from the cache and batch the rest
+    pending = []
+    for position, cache_key in enumerate(cache_keys):
+        cached = None if no_cache else await get_cached_job_data(cache_key)
+        if cached is not None:
+            results[position] = cached
+        else:
+            pending.append(position)
+    
+    if len(pending) == 1:
+        position = pending[0]
+        results[position] = await parse_job_description_with_openai(job_texts[position], no_cache=no_cache)
+        return results
+    
+    if pending and os.getenv("OPENAI_API_KEY") and time.monotonic() >= openai_disabled_until:
+        # Fixed-size groups keep every call well inside the model's output limit; the groups run concurrently
+        groups = [pending[start:start + JOB_PARSE_BATCH_SIZE] for start in range(0, len(pending), JOB_PARSE_BATCH_SIZE)]
+        for parsed in await asyncio.gather(*(parse_job_descriptions_group(job_texts, group, cache_keys) for group in groups)):
+            for position, job_data in parsed.items():
+                results[position] = job_data
+    
+    # Anything OpenAI didn't return falls back to the mock analysis
+    missing = [position for position in pending if results[position] is None]
+    if missing:
+        logger.warning("Using mock analysis for job descriptions at positions %s", missing)
+    for position in missing:
+        results[position] = generate_mock_job_analysis(job_texts[position])
+    
+    return results
+
+# Title rules for the mock analysis, in priority order. Each rule is a tuple of
+# keyword groups and matches when at least one keyword of every group is present.
+MOCK_JOB_TITLE_RULES = (
+    ("Senior Software Engineer", (("senior",), ("developer", "engineer"))),
+    ("Junior Software Engineer", (("junior",), ("developer", "engineer"))),
+    ("Lead Software Engineer", (("lead", "principal"),)),
+    ("Frontend Developer", (("frontend", "front-end"),)),
+    ("Backend Developer", (("backend", "back-end"),)),
+    ("Full Stack Developer", (("fullstack", "full-stack"),)),
+    ("Data Scientist", (("data",), ("scientist",))),
+    ("DevOps Engineer", (("devops",),)),
+)
+
+# Common skills detected by the mock analysis: lowercase keyword -> display name
+MOCK_SKILL_KEYWORDS = {
+    "python": "Python", "javascript": "JavaScript", "java": "Java", 
+    "react": "React", "angular": "Angular", "vue": "Vue.js",
+    "node": "Node.js", "express": "Express.js", "django": "Django",
+    "flask": "Flask", "sql": "SQL", "postgresql": "PostgreSQL",
+    "mysql": "MySQL", "mongodb": "MongoDB", "redis": "Redis",
+    "docker": "Docker", "kubernetes": "Kubernetes", "aws": "AWS",
+    "azure": "Azure", "gcp": "Google Cloud", "git": "Git",
+    "ci/cd": "CI/CD", "jenkins": "Jenkins", "terraform": "Terraform",
+    "typescript": "TypeScript", "html": "HTML", "css": "CSS",
+    "sass": "SASS", "webpack": "Webpack", "babel": "Babel",
+    "rest": "REST APIs", "graphql": "GraphQL", "microservices": "Microservices"
+}
+
+# Frozen (keyword, skill name) pairs with interned keywords. The automaton below
+# reports these same string objects, so set lookups hit the identity fast path.
+MOCK_SKILL_ITEMS = tuple(
+    (sys.intern(keyword), skill_name) for keyword, skill_name in MOCK_SKILL_KEYWORDS.items()
+)
+
+# One automaton over all title and skill keywords, built once at import
+MOCK_KEYWORD_AUTOMATON = ahocorasick.Automaton()
+for keyword in [k for k, _ in MOCK_SKILL_ITEMS] + [k for _, groups in MOCK_JOB_TITLE_RULES for group in groups for k in group]:
+    MOCK_KEYWORD_AUTOMATON.add_word(keyword, sys.intern(keyword))
+MOCK_KEYWORD_AUTOMATON.make_automaton()
+
 def generate_mock_job_analysis(job_text: str) -> Dict[str, Any]:
     """
     Generate a mock job analysis when OpenAI API is not available
@@ -127,44 +406,21 @@ def generate_mock_job_analysis(job_text: str) -> Dict[str, Any]:
     # Try to extract some basic information from the text
     text_lower = job_text.lower()
     
-    # Simple job title detection
+    # Find every title and skill keyword in a single pass over the text
+    found_keywords = {keyword for _, keyword in MOCK_KEYWORD_AUTOMATON.iter(text_lower)}
+    
+    # Simple job title detection - first rule whose keyword groups all match wins
     job_title = "Software Engineer"  # Default
-    if "senior" in text_lower and ("developer" in text_lower or "engineer" in text_lower):
-        job_title = "Senior Software Engineer"
-    elif "junior" in text_lower and ("developer" in text_lower or "engineer" in text_lower):
-        job_title = "Junior Software Engineer"
-    elif "lead" in text_lower or "principal" in text_lower:
-        job_title = "Lead Software Engineer"
-    elif "frontend" in text_lower or "front-end" in text_lower:
-        job_title = "Frontend Developer"
-    elif "backend" in text_lower or "back-end" in text_lower:
-        job_title = "Backend Developer"
-    elif "fullstack" in text_lower or "full-stack" in text_lower:
-        job_title = "Full Stack Developer"
-    elif "data" in text_lower and "scientist" in text_lower:
-        job_title = "Data Scientist"
-    elif "devops" in text_lower:
-        job_title = "DevOps Engineer"
+    for title, keyword_groups in MOCK_JOB_TITLE_RULES:
+        if all(not found_keywords.isdisjoint(group) for group in keyword_groups):
+            job_title = title
+            break
     
     # Detect common skills mentioned in the text
-    skill_keywords = {
-        "python": "Python", "javascript": "JavaScript", "java": "Java", 
-        "react": "React", "angular": "Angular", "vue": "Vue.js",
-        "node": "Node.js", "express": "Express.js", "django": "Django",
-        "flask": "Flask", "sql": "SQL", "postgresql": "PostgreSQL",
-        "mysql": "MySQL", "mongodb": "MongoDB", "redis": "Redis",
-        "docker": "Docker", "kubernetes": "Kubernetes", "aws": "AWS",
-        "azure": "Azure", "gcp": "Google Cloud", "git": "Git",
-        "ci/cd": "CI/CD", "jenkins": "Jenkins", "terraform": "Terraform",
-        "typescript": "TypeScript", "html": "HTML", "css": "CSS",
-        "sass": "SASS", "webpack": "Webpack", "babel": "Babel",
-        "rest": "REST APIs", "graphql": "GraphQL", "microservices": "Microservices"
-    }
-    
-    detected_skills = []
-    for keyword, skill_name in skill_keywords.items():
-        if keyword in text_lower:
-            detected_skills.append(skill_name)
+    detected_skills = [
+        skill_name for keyword, skill_name in MOCK_SKILL_ITEMS
+        if keyword in found_keywords
+    ]
     
     # If no skills detected, provide common ones
     if not detected_skills:
@@ -211,18 +467,24 @@ def generate_demo_skill_match(resume_skills: List[str]) -> Dict[str, Any]:
     matched_required = []
     matched_preferred = []
     
+    # Lowercase every skill once up front rather than per comparison
+    demo_required_lower = [(skill, skill.lower()) for skill in demo_required_skills]
+    demo_preferred_lower = [(skill, skill.lower()) for skill in demo_preferred_skills]
+    
     for resume_skill in resume_skills:
+        resume_skill_lower = resume_skill.lower()
+        
         # Check exact matches (case insensitive)
-        for demo_skill in demo_required_skills:
-            if resume_skill.lower() == demo_skill.lower():
+        for demo_skill, demo_skill_lower in demo_required_lower:
+            if resume_skill_lower == demo_skill_lower:
                 matched_required.append({
                     "resume_skill": resume_skill,
                     "job_skill": demo_skill,
                     "match_type": "exact"
                 })
         
-        for demo_skill in demo_preferred_skills:
-            if resume_skill.lower() == demo_skill.lower():
+        for demo_skill, demo_skill_lower in demo_preferred_lower:
+            if resume_skill_lower == demo_skill_lower:
                 matched_preferred.append({
                     "resume_skill": resume_skill,
                     "job_skill": demo_skill,
@@ -234,12 +496,12 @@ def generate_demo_skill_match(resume_skills: List[str]) -> Dict[str, Any]:
     preferred_match_percent = (len(matched_preferred) / len(demo_preferred_skills)) * 100 if demo_preferred_skills else 0
     overall_match_percent = (required_match_percent * 0.7 + preferred_match_percent * 0.3)
     
-    # Missing skills
-    matched_required_names = [m["job_skill"].lower() for m in matched_required]
-    matched_preferred_names = [m["job_skill"].lower() for m in matched_preferred]
+    # Missing skills - set lookups instead of rescanning the matched list per skill
+    matched_required_names = {m["job_skill"].lower() for m in matched_required}
+    matched_preferred_names = {m["job_skill"].lower() for m in matched_preferred}
     
-    missing_required = [skill for skill in demo_required_skills if skill.lower() not in matched_required_names]
-    missing_preferred = [skill for skill in demo_preferred_skills if skill.lower() not in matched_preferred_names]
+    missing_required = [skill for skill, skill_lower in demo_required_lower if skill_lower not in matched_required_names]
+    missing_preferred = [skill for skill, skill_lower in demo_preferred_lower if skill_lower not in matched_preferred_names]
     
     return {
         "overall_match_percentage": round(overall_match_percent, 1),
@@ -270,6 +532,64 @@ def generate_demo_skill_match(resume_skills: List[str]) -> Dict[str, Any]:
         "demo_note": "This is a demo analysis using sample job requirements. For accurate matching, please configure OpenAI API credentials."
     }
 
+def build_skill_automaton(skills_norm: List[str]):
+    """
+    Build an Aho-Corasick automaton over normalized skill names, or None if there are none
+    """
+    automaton = ahocorasick.Automaton()
+    for skill_norm in skills_norm:
+        if skill_norm:
+            automaton.add_word(skill_norm, skill_norm)
+    
+    if not len(automaton):
+        return None
+    
+    automaton.make_automaton()
+    return automaton
+
+def find_partial_skill_matches(
+    resume_skills: List[str],
+    resume_skills_norm: List[str],
+    resume_automaton,
+    job_skills: List[str],
+    job_skills_norm: List[str]
+) -> List[Dict[str, Any]]:
+    """
+    Find job skills that contain, or are contained in, resume skills without an exact match
+    """
+    job_automaton = build_skill_automaton(job_skills_norm)
+    if job_automaton is None or resume_automaton is None:
+        return []
+    
+    job_positions = {}
+    for position, job_skill_norm in enumerate(job_skills_norm):
+        job_positions.setdefault(job_skill_norm, []).append(position)
+    
+    # Resume skills occurring inside each job skill, inverted to resume skill -> job skills
+    job_skills_containing = {}
+    for job_skill_norm in job_positions:
+        for _, resume_skill_norm in resume_automaton.iter(job_skill_norm):
+            job_skills_containing.setdefault(resume_skill_norm, set()).add(job_skill_norm)
+    
+    partial_matches = []
+    for resume_skill, resume_skill_norm in zip(resume_skills, resume_skills_norm):
+        # Skip blanks and resume skills that already have an exact match
+        if not resume_skill_norm or resume_skill_norm in job_positions:
+            continue
+        
+        # Job skills inside the resume skill, plus job skills containing it
+        hits = {job_skill_norm for _, job_skill_norm in job_automaton.iter(resume_skill_norm)}
+        hits.update(job_skills_containing.get(resume_skill_norm, ()))
+        
+        for position in sorted(p for job_skill_norm in hits for p in job_positions[job_skill_norm]):
+            partial_matches.append({
+                "resume_skill": resume_skill,
+                "job_skill": job_skills[position],
+                "match_type": "partial"
+            })
+    
+    return partial_matches
+
 def analyze_skill_match(resume_skills: List[str], job_required_skills: List[str], job_preferred_skills: List[str]) -> Dict[str, Any]:
     """
     Analyze skill match between resume and job description
@@ -277,75 +597,67 @@ def analyze_skill_match(resume_skills: List[str], job_required_skills: List[str]
     
     # Check if this looks like demo data (empty skills lists indicate failed OpenAI parsing)
     if not job_required_skills and not job_preferred_skills:
-        print("🔄 No job skills found - generating demo skill match...")
+        logger.info("No job skills found, generating demo skill match")
         return generate_demo_skill_match(resume_skills)
     
-    # Normalize skills to lowercase for comparison
-    resume_skills_lower = [skill.lower().strip() for skill in resume_skills if skill]
-    job_required_lower = [skill.lower().strip() for skill in job_required_skills if skill]
-    job_preferred_lower = [skill.lower().strip() for skill in job_preferred_skills if skill]
+    # Normalize job skills once and index the original spellings by normalized form
+    job_required_norm = [skill.lower().strip() for skill in job_required_skills]
+    job_preferred_norm = [skill.lower().strip() for skill in job_preferred_skills]
+    
+    job_required_by_norm = {}
+    for job_skill, job_skill_norm in zip(job_required_skills, job_required_norm):
+        job_required_by_norm.setdefault(job_skill_norm, []).append(job_skill)
+    
+    job_preferred_by_norm = {}
+    for job_skill, job_skill_norm in zip(job_preferred_skills, job_preferred_norm):
+        job_preferred_by_norm.setdefault(job_skill_norm, []).append(job_skill)
+    
+    resume_skills_norm = [skill.lower().strip() for skill in resume_skills]
     
     # Find exact matches
     matched_required = []
     matched_preferred = []
     
-    for resume_skill in resume_skills:
-        resume_skill_lower = resume_skill.lower().strip()
-        
+    for resume_skill, resume_skill_norm in zip(resume_skills, resume_skills_norm):
         # Check required skills
-        for job_skill in job_required_skills:
-            if resume_skill_lower == job_skill.lower().strip():
-                matched_required.append({
-                    "resume_skill": resume_skill,
-                    "job_skill": job_skill,
-                    "match_type": "exact"
-                })
+        for job_skill in job_required_by_norm.get(resume_skill_norm, ()):
+            matched_required.append({
+                "resume_skill": resume_skill,
+                "job_skill": job_skill,
+                "match_type": "exact"
+            })
         
         # Check preferred skills
-        for job_skill in job_preferred_skills:
-            if resume_skill_lower == job_skill.lower().strip():
-                matched_preferred.append({
-                    "resume_skill": resume_skill,
-                    "job_skill": job_skill,
-                    "match_type": "exact"
-                })
+        for job_skill in job_preferred_by_norm.get(resume_skill_norm, ()):
+            matched_preferred.append({
+                "resume_skill": resume_skill,
+                "job_skill": job_skill,
+                "match_type": "exact"
+            })
     
     # Find partial matches (contains)
-    partial_matched_required = []
-    partial_matched_preferred = []
+    resume_automaton = build_skill_automaton(resume_skills_norm)
     
-    for resume_skill in resume_skills:
-        resume_skill_lower = resume_skill.lower().strip()
-        
-        # Check if resume skill contains or is contained in job skills
-        for job_skill in job_required_skills:
-            job_skill_lower = job_skill.lower().strip()
-            if (resume_skill_lower in job_skill_lower or job_skill_lower in resume_skill_lower) and \
-               not any(m["resume_skill"].lower() == resume_skill.lower() for m in matched_required):
-                partial_matched_required.append({
-                    "resume_skill": resume_skill,
-                    "job_skill": job_skill,
-                    "match_type": "partial"
-                })
-        
-        for job_skill in job_preferred_skills:
-            job_skill_lower = job_skill.lower().strip()
-            if (resume_skill_lower in job_skill_lower or job_skill_lower in resume_skill_lower) and \
-               not any(m["resume_skill"].lower() == resume_skill.lower() for m in matched_preferred):
-                partial_matched_preferred.append({
-                    "resume_skill": resume_skill,
-                    "job_skill": job_skill,
-                    "match_type": "partial"
-                })
+    partial_matched_required = find_partial_skill_matches(
+        resume_skills, resume_skills_norm, resume_automaton,
+        job_required_skills, job_required_norm
+    )
+    partial_matched_preferred = find_partial_skill_matches(
+        resume_skills, resume_skills_norm, resume_automaton,
+        job_preferred_skills, job_preferred_norm
+    )
     
-    # Find missing skills
-    matched_required_skills_lower = [m["job_skill"].lower() for m in matched_required + partial_matched_required]
-    matched_preferred_skills_lower = [m["job_skill"].lower() for m in matched_preferred + partial_matched_preferred]
+    # Find missing skills, reusing the normalized forms computed above
+    job_required_norm_of = dict(zip(job_required_skills, job_required_norm))
+    job_preferred_norm_of = dict(zip(job_preferred_skills, job_preferred_norm))
     
-    missing_required = [skill for skill in job_required_skills 
-                       if skill.lower() not in matched_required_skills_lower]
-    missing_preferred = [skill for skill in job_preferred_skills 
-                        if skill.lower() not in matched_preferred_skills_lower]
+    matched_required_norm = {job_required_norm_of[m["job_skill"]] for m in matched_required + partial_matched_required}
+    matched_preferred_norm = {job_preferred_norm_of[m["job_skill"]] for m in matched_preferred + partial_matched_preferred}
+    
+    missing_required = [skill for skill, skill_norm in zip(job_required_skills, job_required_norm)
+                       if skill_norm not in matched_required_norm]
+    missing_preferred = [skill for skill, skill_norm in zip(job_preferred_skills, job_preferred_norm)
+                        if skill_norm not in matched_preferred_norm]
     
     # Calculate match percentages
     total_required = len(job_required_skills)
@@ -383,31 +695,63 @@ def analyze_skill_match(resume_skills: List[str], job_required_skills: List[str]
         }
     }
 
-async def process_job_description(file_content: bytes, filename: str) -> Dict[str, Any]:
+async def process_job_description(file_path: str, filename: str, no_cache: bool = False) -> Dict[str, Any]:
     """
     Main function to process job description PDF and extract structured data
     """
-    print(f"=== PROCESSING JOB DESCRIPTION ===")
-    print(f"Filename: {filename}")
-    print(f"File size: {len(file_content)} bytes")
+    logger.info("Processing job description %s (%d bytes)", filename, os.path.getsize(file_path))
     
     # Extract text from PDF
-    job_text = extract_text_from_pdf(file_content)
+    job_text = await extract_text_from_pdf_async(file_path)
     
     if not job_text:
-        print("❌ Could not extract text from PDF")
+        logger.warning("Could not extract text from PDF: %s", filename)
         return {
             "success": False,
             "error": "Could not extract text from PDF file"
         }
     
-    print(f"Extracted text length: {len(job_text)} characters")
+    logger.debug("Extracted text length: %d characters", len(job_text))
     
     # Parse with OpenAI
-    job_data = await parse_job_description_with_openai(job_text)
+    job_data = await parse_job_description_with_openai(job_text, no_cache=no_cache)
     
     return {
         "success": True,
         "job_data": job_data,
         "raw_text": job_text
     }
+
+
+async def process_job_descriptions_batch(files: List[Tuple[Union[bytes, str], str]], no_cache: bool = False) -> List[Dict[str, Any]]:
+    """
+    Process several job description PDFs, given as (bytes or file path, filename), parsing all of them with one OpenAI call
+    """
+    logger.info("Processing %d job descriptions", len(files))
+    
+    job_texts = await asyncio.gather(*(extract_text_from_pdf_async(source) for source, _ in files))
+    
+    results = [None] * len(files)
+    parsed_positions = []
+    for position, (job_text, (_, filename)) in enumerate(zip(job_texts, files)):
+        if job_text:
+            parsed_positions.append(position)
+        else:
+            logger.warning("Could not extract text from PDF: %s", filename)
+            results[position] = {
+                "success": False,
+                "error": "Could not extract text from PDF file"
+            }
+    
+    parsed = await parse_job_descriptions_batch(
+        [job_texts[position] for position in parsed_positions],
+        no_cache=no_cache
+    )
+    for position, job_data in zip(parsed_positions, parsed):
+        results[position] = {
+            "success": True,
+            "job_data": job_data,
+            "raw_text": job_texts[position]
+        }
+    
+    return results
@@ -1,13 +1,21 @@
-from fastapi import FastAPI, UploadFile, File, HTTPException, BackgroundTasks, Depends
+from fastapi import FastAPI, UploadFile, File, HTTPException, Depends, Query
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from sqlalchemy.orm import Session
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 import os
 import sys
+import asyncio
+import bisect
+import functools
+import logging
 import uuid
-import json
+import tempfile
+import orjson
 from datetime import datetime
 from pathlib import Path
+from typing import List, Optional
 
 # Add current directory to path for imports
 current_dir = Path(__file__).parent
@@ -15,20 +23,24 @@ sys.path.insert(0, str(current_dir))
 
 from dotenv import load_dotenv
 # Database imports
-from db import get_db, engine
+from db import get_db, engine, SessionLocal, add_message_count_column, reserve_message_orders
 from models import Base, Resume, ChatSession, ChatMessage
 from vlm import parse_resume_with_vlm
-from openai_chat import get_chat_response
-from job_analysis import process_job_description, analyze_skill_match
-from schemas import ChatRequest, ResumeResponse
+from openai_chat import get_chat_response, get_chat_responses_batch, get_suggested_questions, warm_openai_connection, http_client as openai_http_client
+from job_analysis import process_job_description, process_job_descriptions_batch, analyze_skill_match, shutdown_pdf_process_pool
+from schemas import ChatRequest, ChatMessageSchema, ResumeResponse
+from status_store import StatusStore, close_status_store
+from batch_jobs import submit_chat_requests, poll_chat_batches
 
 # Load environment variables
 load_dotenv()
 
-# Create database tables
-Base.metadata.create_all(bind=engine)
+# Set LOG_LEVEL=DEBUG to see per-request upload details
+logging.basicConfig()
+logger = logging.getLogger(__name__)
+logger.setLevel(os.getenv("LOG_LEVEL", "INFO"))
 
-app = FastAPI(title="Resume Parser API", version="1.0.0")
+app = FastAPI(title="Resume Parser API", version="1.0.0", default_response_class=ORJSONResponse)
 
 # Configure CORS
 app.add_middleware(
@@ -39,15 +51,181 @@ app.add_middleware(
         "http://127.0.0.1:3000", 
         "http://127.0.0.1:3001",
         "https://nymph-frontend.onrender.com",  # Production frontend
-        "https://*.onrender.com"  # Allow any Render subdomain
     ],
+    allow_origin_regex=r"^https://([a-z0-9-]+\.)?onrender\.com$",  # Allow any Render subdomain
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
 )
 
+# Background job queues - each kind of upstream call gets its own worker pool
+JOB_QUEUE_WORKERS = {
+    "vlm": int(os.getenv("VLM_JOB_WORKERS", "4")),
+    "openai": int(os.getenv("OPENAI_JOB_WORKERS", "8")),
+}
+# Most jobs waiting per queue - uploads are refused with 503 beyond this
+JOB_QUEUE_MAX_SIZE = int(os.getenv("JOB_QUEUE_MAX_SIZE", "100"))
+job_queues = {}
+job_workers = []
+
+async def run_job_worker(queue: asyncio.Queue):
+    """Run queued background jobs one at a time"""
+    while True:
+        task, args, abandon = await queue.get()
+        try:
+            await task(*args)
+        except asyncio.CancelledError:
+            # Shutting down mid-job - report it instead of leaving the job "processing"
+            await abandon("Server shut down before the job finished")
+            raise
+        except Exception as e:
+            logger.exception("Background job error: %s", e)
+        finally:
+            queue.task_done()
+
+async def enqueue_job(queue_name: str, abandon, task, *args):
+    """
+    Hand a background job to the worker pool for queue_name.
+    abandon(error) marks the job failed and removes its files if the job never gets to finish.
+    """
+    try:
+        job_queues[queue_name].put_nowait((task, args, abandon))
+    except asyncio.QueueFull:
+        await abandon("Server busy")
+        raise HTTPException(status_code=503, detail="Too many uploads in progress, please try again shortly")
+
+async def abandon_jobs(store: StatusStore, job_ids: List[str], file_paths: List[str], error: str):
+    """Mark jobs failed and remove their staged uploads"""
+    for job_id in job_ids:
+        await store.set(job_id, {"status": "error", "progress": 0, "error": error})
+    for file_path in file_paths:
+        remove_temp_file(file_path)
+
+@app.on_event("startup")
+async def start_job_workers():
+    """Start the worker pool for every job queue"""
+    for queue_name, worker_count in JOB_QUEUE_WORKERS.items():
+        queue = asyncio.Queue(maxsize=JOB_QUEUE_MAX_SIZE)
+        job_queues[queue_name] = queue
+        job_workers.extend(asyncio.create_task(run_job_worker(queue)) for _ in range(worker_count))
+
+@app.on_event("startup")
+async def start_batch_poller():
+    """Check submitted chat batches in the background"""
+    job_workers.append(asyncio.create_task(poll_chat_batches()))
+
+@app.on_event("startup")
+async def warm_openai():
+    """Warm the OpenAI connection in the background so start-up isn't held up"""
+    job_workers.append(asyncio.create_task(warm_openai_connection()))
+
+@app.on_event("shutdown")
+async def stop_job_workers():
+    """Cancel the job workers on shutdown and fail the jobs still waiting in their queues"""
+    for worker in job_workers:
+        worker.cancel()
+    await asyncio.gather(*job_workers, return_exceptions=True)
+    job_workers.clear()
+    
+    for queue in job_queues.values():
+        while not queue.empty():
+            _, _, abandon = queue.get_nowait()
+            await abandon("Server shut down before the job started")
+
+@app.on_event("startup")
+async def create_tables():
+    """Create database tables"""
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        # create_all never alters existing tables
+        await add_message_count_column(conn)
+
+@app.on_event("shutdown")
+async def dispose_engine():
+    """Close pooled database connections on shutdown"""
+    await engine.dispose()
+
+@app.on_event("shutdown")
+async def close_openai_client():
+    """Close pooled OpenAI connections on shutdown"""
+    await openai_http_client.aclose()
+
+@app.on_event("shutdown")
+async def stop_pdf_workers():
+    """Stop the worker processes used for very large PDFs"""
+    await asyncio.to_thread(shutdown_pdf_process_pool)
+
+@app.on_event("shutdown")
+async def close_redis_client():
+    """Close pooled Redis connections on shutdown"""
+    await close_status_store()
+
 # Store for tracking parsing status (temporary until processing completes)
-parsing_status = {}
+parsing_status = StatusStore("parse")
+
+# Saved resumes never change after upload, so lookups by job ID are cached
+resume_cache = StatusStore("resume")
+
+async def cache_resume(job_id: str, resume_id: int, filename: str, parsed_data) -> dict:
+    """Store the fields the API reads from a saved resume"""
+    cached = {"id": resume_id, "filename": filename, "parsed_data": parsed_data}
+    await resume_cache.set(job_id, cached)
+    return cached
+
+async def get_resume_cached(job_id: str):
+    """Get a saved resume by job ID, from the cache or the database"""
+    cached = await resume_cache.get(job_id)
+    if cached is not None:
+        return cached
+    
+    # A connection is only checked out on a cache miss
+    async with SessionLocal() as db:
+        # Only the cached columns are selected - no full ORM object is built
+        row = (await db.execute(
+            select(Resume.id, Resume.filename, Resume.parsed_data).where(Resume.user_session == job_id).limit(1)
+        )).first()
+    if not row:
+        return None
+    return await cache_resume(job_id, *row)
+
+# Uploads are copied to disk in chunks of this size
+UPLOAD_CHUNK_SIZE = 1 << 20
+
+ALLOWED_RESUME_EXTS = frozenset({".pdf", ".doc", ".docx"})
+
+# Uploads are staged in memory-backed /dev/shm when the host has it, so parsing never waits on disk
+UPLOAD_TMP_DIR = os.getenv("UPLOAD_TMP_DIR") or ("/dev/shm" if os.path.isdir("/dev/shm") else None)
+
+async def save_upload_to_temp(file: UploadFile) -> str:
+    """Stream an upload to a temporary file and return its path"""
+    try:
+        return await write_upload(file, UPLOAD_TMP_DIR)
+    except OSError as e:
+        if UPLOAD_TMP_DIR is None:
+            raise
+        # /dev/shm is small in containers - fall back to the regular temp directory when it's full
+        logger.warning("Could not stage upload in %s, using disk: %s", UPLOAD_TMP_DIR, e)
+        await file.seek(0)
+        return await write_upload(file, None)
+
+async def write_upload(file: UploadFile, directory: Optional[str]) -> str:
+    """Copy an upload into a new temporary file in directory and return its path"""
+    tmp = tempfile.NamedTemporaryFile(delete=False, suffix=Path(file.filename).suffix, dir=directory)
+    try:
+        with tmp:
+            while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                tmp.write(chunk)
+    except OSError:
+        remove_temp_file(tmp.name)
+        raise
+    return tmp.name
+
+def remove_temp_file(file_path: str):
+    """Delete a temporary upload, ignoring files that are already gone"""
+    try:
+        os.unlink(file_path)
+    except FileNotFoundError:
+        pass
 
 @app.get("/")
 async def root():
@@ -55,20 +233,15 @@ async def root():
 
 @app.post("/upload-resume")
 async def upload_resume(
-    background_tasks: BackgroundTasks,
-    file: UploadFile = File(...),
-    db: Session = Depends(get_db)
+    file: UploadFile = File(...)
 ):
     """Upload and parse resume using VLM"""
     
-    print(f"=== UPLOAD RECEIVED ===")
-    print(f"Filename: {file.filename}")
-    print(f"Content type: {file.content_type}")
-    print(f"File size: {file.size if hasattr(file, 'size') else 'unknown'}")
+    logger.debug("Resume upload received: %s (%s, %s bytes)", file.filename, file.content_type, file.size)
     
     # Validate file type
-    if not file.filename.lower().endswith(('.pdf', '.doc', '.docx')):
-        print(f"Invalid file type: {file.filename}")
+    if Path(file.filename).suffix.lower() not in ALLOWED_RESUME_EXTS:
+        logger.info("Invalid file type: %s", file.filename)
         raise HTTPException(
             status_code=400, 
             detail="Only PDF, DOC, and DOCX files are supported"
@@ -76,125 +249,183 @@ async def upload_resume(
     
     # Generate unique job ID (will become resume ID later)
     job_id = str(uuid.uuid4())
-    parsing_status[job_id] = {"status": "processing", "progress": 0}
-    
-    print(f"Generated job ID: {job_id}")
+    await parsing_status.set(job_id, {"status": "processing", "progress": 0})
     
-    # Read file content
-    file_content = await file.read()
-    print(f"File content size: {len(file_content)} bytes")
+    # Stream file content to disk instead of holding it in memory
+    file_path = await save_upload_to_temp(file)
     
-    # Start background parsing task
-    background_tasks.add_task(
+    # Queue background parsing task
+    await enqueue_job(
+        "vlm",
+        functools.partial(abandon_jobs, parsing_status, [job_id], [file_path]),
         process_resume, 
         job_id, 
-        file_content, 
+        file_path, 
         file.filename
     )
     
-    print(f"Background task started for job: {job_id}")
+    logger.info("Resume %s queued for parsing as job %s", file.filename, job_id)
     return {"job_id": job_id, "status": "processing"}
 
 @app.get("/parsing-status/{job_id}")
-async def get_parsing_status(job_id: str, db: Session = Depends(get_db)):
+async def get_parsing_status(job_id: str):
     """Check the status of resume parsing"""
     
-    # First check in-memory status for active processing
-    if job_id in parsing_status:
-        return parsing_status[job_id]
+    # First check stored status for active processing
+    status_info = await parsing_status.get(job_id)
+    if status_info is not None:
+        return status_info
     
     # If not in memory, check if it's completed in database
-    resume = db.query(Resume).filter(Resume.user_session == job_id).first()
+    resume = await get_resume_cached(job_id)
     if resume:
-        return {"status": "completed", "progress": 100, "resume_id": resume.id}
+        return {"status": "completed", "progress": 100, "resume_id": resume["id"]}
     
     raise HTTPException(status_code=404, detail="Job not found")
 
 @app.get("/resume/{job_id}")
-async def get_resume(job_id: str, db: Session = Depends(get_db)):
+async def get_resume(job_id: str):
     """Get parsed resume data"""
     
     # Check if job is still processing
-    if job_id in parsing_status:
-        status_info = parsing_status[job_id]
+    status_info = await parsing_status.get(job_id)
+    if status_info is not None:
         if status_info["status"] != "completed":
             raise HTTPException(status_code=400, detail="Resume parsing not completed")
         # If completed in memory, return the result
         return status_info.get("result", {})
     
     # Otherwise, fetch from database
-    resume = db.query(Resume).filter(Resume.user_session == job_id).first()
+    resume = await get_resume_cached(job_id)
     if not resume:
         raise HTTPException(status_code=404, detail="Resume not found")
     
-    return resume.parsed_data
+    return resume["parsed_data"]
+
+@app.get("/suggested-questions/{job_id}")
+async def get_resume_suggested_questions(job_id: str, with_answers: bool = False):
+    """Suggested chat questions for a parsed resume, optionally with an AI answer to each"""
+    resume = await get_resume_cached(job_id)
+    if not resume:
+        raise HTTPException(status_code=404, detail="Resume not found")
+    
+    resume_data = resume["parsed_data"]
+    if isinstance(resume_data, (str, bytes)):
+        # Rows written as a JSON string before parsed_data was a native JSON column
+        resume_data = orjson.loads(resume_data)
+    questions = list(get_suggested_questions(resume_data))
+    if not with_answers:
+        return {"questions": questions}
+    
+    # Every question is answered at once instead of one call after another
+    try:
+        answers = await get_chat_responses_batch([(question, resume_data, ()) for question in questions])
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    
+    return {"questions": questions, "answers": answers}
+
+async def save_chat_turn(db: AsyncSession, session_id: str, next_order: int, message: str, response: str):
+    """Store the user message and assistant response in one commit"""
+    user_message = ChatMessage(
+        session_id=session_id,
+        role="user",
+        content=message,
+        message_order=next_order
+    )
+    assistant_message = ChatMessage(
+        session_id=session_id,
+        role="assistant", 
+        content=response,
+        message_order=next_order + 1
+    )
+    db.add_all([user_message, assistant_message])
+    await db.commit()
+
+async def stream_chat_turn(db: AsyncSession, request: ChatRequest, chat_history: list, session_id: str, next_order: int):
+    """Send the chat reply as Server-Sent Events, then store the turn"""
+    parts = []
+    try:
+        async for delta in get_chat_response(
+            request.message,
+            request.resume_data,
+            chat_history,
+            deterministic=request.deterministic,
+            model_override=request.model_override
+        ):
+            parts.append(delta)
+            yield b"data: " + orjson.dumps({"delta": delta}) + b"\n\n"
+        
+        await save_chat_turn(db, session_id, next_order, request.message, "".join(parts))
+        yield b"event: done\ndata: " + orjson.dumps({"session_id": session_id, "message_count": next_order + 1}) + b"\n\n"
+    
+    except Exception as e:
+        logger.exception("Chat stream error: %s", e)
+        await db.rollback()
+        yield b"event: error\ndata: " + orjson.dumps({"detail": str(e)}) + b"\n\n"
 
 @app.post("/chat")
-async def chat_with_resume(request: ChatRequest, db: Session = Depends(get_db)):
+async def chat_with_resume(request: ChatRequest, db: AsyncSession = Depends(get_db)):
     """Chat about the resume using OpenAI with persistence"""
     try:
         # Get or create chat session
         session_id = getattr(request, 'session_id', None) or str(uuid.uuid4())
+        use_stored_history = not (hasattr(request, 'chat_history') and request.chat_history)
+        
+        # Load the session together with its messages when they are needed for history
+        session_query = select(ChatSession).where(ChatSession.session_id == session_id)
+        if use_stored_history:
+            session_query = session_query.options(selectinload(ChatSession.messages))
+        chat_session = (await db.execute(session_query)).scalars().first()
+        
+        # Get chat history for context
+        if not use_stored_history:
+            chat_history = request.chat_history
+        elif chat_session:
+            # Stored messages were validated when they were saved, so skip validating them again
+            chat_history = [ChatMessageSchema.model_construct(role=msg.role, content=msg.content) for msg in chat_session.messages]
+        else:
+            chat_history = []
         
-        chat_session = db.query(ChatSession).filter(ChatSession.session_id == session_id).first()
         if not chat_session:
             # Create new chat session
             resume_id = None
             if hasattr(request, 'resume_id') and request.resume_id:
                 resume_id = request.resume_id
             
+            # Saved together with the first messages below, holding orders 1 and 2
             chat_session = ChatSession(
                 session_id=session_id,
-                resume_id=resume_id
+                resume_id=resume_id,
+                message_count=2
             )
             db.add(chat_session)
-            db.commit()
-            db.refresh(chat_session)
-        
-        # Get current message order
-        last_message = db.query(ChatMessage).filter(
-            ChatMessage.session_id == session_id
-        ).order_by(ChatMessage.message_order.desc()).first()
-        next_order = (last_message.message_order + 1) if last_message else 1
-        
-        # Store user message
-        user_message = ChatMessage(
-            session_id=session_id,
-            role="user",
-            content=request.message,
-            message_order=next_order
-        )
-        db.add(user_message)
-        
-        # Get chat history for context
-        chat_history = []
-        if hasattr(request, 'chat_history') and request.chat_history:
-            chat_history = request.chat_history
+            next_order = 1
         else:
-            # Load from database
-            messages = db.query(ChatMessage).filter(
-                ChatMessage.session_id == session_id,
-                ChatMessage.message_order < next_order
-            ).order_by(ChatMessage.message_order).all()
-            
-            chat_history = [{"role": msg.role, "content": msg.content} for msg in messages]
+            # Take the next two message orders from the session counter, atomically in the database.
+            # Committed straight away so the row isn't locked while the reply is generated.
+            next_order = await reserve_message_orders(db, session_id)
+            await db.commit()
+        
+        if request.stream:
+            # Tokens go out as they arrive; the turn is stored once the stream ends
+            return StreamingResponse(
+                stream_chat_turn(db, request, chat_history, session_id, next_order),
+                media_type="text/event-stream"
+            )
         
         # Get AI response
-        response = await get_chat_response(
-            request.message,
-            request.resume_data,
-            chat_history
-        )
+        response = "".join([
+            delta async for delta in get_chat_response(
+                request.message,
+                request.resume_data,
+                chat_history,
+                deterministic=request.deterministic,
+                model_override=request.model_override
+            )
+        ])
         
-        # Store assistant response
-        assistant_message = ChatMessage(
-            session_id=session_id,
-            role="assistant", 
-            content=response,
-            message_order=next_order + 1
-        )
-        db.add(assistant_message)
-        db.commit()
+        await save_chat_turn(db, session_id, next_order, request.message, response)
         
         return {
             "response": response, 
@@ -203,75 +434,102 @@ async def chat_with_resume(request: ChatRequest, db: Session = Depends(get_db)):
         }
         
     except Exception as e:
-        db.rollback()
+        await db.rollback()
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/chat-batch")
+async def chat_batch(requests: List[ChatRequest]):
+    """Queue chat requests for the OpenAI Batch API - replies are saved to their sessions within 24 hours"""
+    if not requests:
+        raise HTTPException(status_code=400, detail="No chat requests provided")
+    
+    for request in requests:
+        request.session_id = request.session_id or str(uuid.uuid4())
+    session_ids = [request.session_id for request in requests]
+    if len(set(session_ids)) != len(session_ids):
+        raise HTTPException(status_code=400, detail="Each batched request needs its own session")
+    
+    try:
+        batch_id = await submit_chat_requests(requests)
+    except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+    
+    return {"batch_id": batch_id, "session_ids": session_ids}
 
 @app.get("/chat-history/{session_id}")
-async def get_chat_history(session_id: str, db: Session = Depends(get_db)):
-    """Get chat history for a session"""
-    messages = db.query(ChatMessage).filter(
-        ChatMessage.session_id == session_id
-    ).order_by(ChatMessage.message_order).all()
+async def get_chat_history(
+    session_id: str,
+    limit: int = Query(200, ge=1, le=1000),
+    before_order: Optional[int] = None,
+    db: AsyncSession = Depends(get_db)
+):
+    """Get chat history for a session, newest `limit` messages before `before_order`"""
+    query = select(
+        ChatMessage.role,
+        ChatMessage.content,
+        ChatMessage.timestamp,
+        ChatMessage.message_order
+    ).where(ChatMessage.session_id == session_id)
+    if before_order is not None:
+        query = query.where(ChatMessage.message_order < before_order)
+    
+    # Newest page first from the (session_id, message_order) index, returned oldest first
+    rows = (await db.execute(
+        query.order_by(ChatMessage.message_order.desc()).limit(limit)
+    )).all()
     
     return [
         {
-            "role": msg.role,
-            "content": msg.content,
-            "timestamp": msg.timestamp.isoformat(),
-            "order": msg.message_order
+            "role": role,
+            "content": content,
+            "timestamp": timestamp.isoformat(),
+            "order": message_order
         }
-        for msg in messages
+        for role, content, timestamp, message_order in reversed(rows)
     ]
 
 @app.get("/chat-sessions")
-async def get_chat_sessions(db: Session = Depends(get_db)):
+async def get_chat_sessions(db: AsyncSession = Depends(get_db)):
     """Get all chat sessions with basic info"""
-    sessions = db.query(ChatSession).order_by(ChatSession.created_at.desc()).all()
-    
-    result = []
-    for session in sessions:
-        # Get message count
-        message_count = db.query(ChatMessage).filter(
-            ChatMessage.session_id == session.session_id
-        ).count()
-        
-        # Get last message
-        last_message = db.query(ChatMessage).filter(
-            ChatMessage.session_id == session.session_id
-        ).order_by(ChatMessage.timestamp.desc()).first()
-        
-        result.append({
+    # Message count and last message time per session, aggregated in one query
+    message_stats = select(
+        ChatMessage.session_id,
+        func.count(ChatMessage.id).label("message_count"),
+        func.max(ChatMessage.timestamp).label("last_message_time")
+    ).group_by(ChatMessage.session_id).subquery()
+    
+    rows = (await db.execute(
+        select(
+            ChatSession,
+            message_stats.c.message_count,
+            message_stats.c.last_message_time
+        ).outerjoin(
+            message_stats, ChatSession.session_id == message_stats.c.session_id
+        ).order_by(ChatSession.created_at.desc())
+    )).all()
+    
+    return [
+        {
             "session_id": session.session_id,
             "resume_id": session.resume_id,
             "created_at": session.created_at.isoformat(),
-            "message_count": message_count,
-            "last_message_time": last_message.timestamp.isoformat() if last_message else None
-        })
-    
-    return result
+            "message_count": message_count or 0,
+            "last_message_time": last_message_time.isoformat() if last_message_time else None
+        }
+        for session, message_count, last_message_time in rows
+    ]
 
-async def process_resume(job_id: str, file_content: bytes, filename: str):
+async def process_resume(job_id: str, file_path: str, filename: str):
     """Background task to process resume and save to database"""
-    from db import SessionLocal  # Import here to avoid dependency issues
-    
     db = SessionLocal()
     try:
-        print(f"=== PROCESSING RESUME ===")
-        print(f"Job ID: {job_id}")
-        print(f"Filename: {filename}")
-        print(f"File size: {len(file_content)} bytes")
-        
         # Update status
-        parsing_status[job_id]["progress"] = 25
+        await parsing_status.set(job_id, {"status": "processing", "progress": 25})
         
-        print("Calling VLM.run parse function...")
         # Parse with VLM
-        parsed_data = await parse_resume_with_vlm(file_content, filename)
+        parsed_data = await parse_resume_with_vlm(file_path, filename)
         
-        print(f"VLM parsing completed. Data type: {type(parsed_data)}")
-        print(f"Parsed data keys: {list(parsed_data.keys()) if isinstance(parsed_data, dict) else 'Not a dict'}")
-        
-        parsing_status[job_id]["progress"] = 75
+        await parsing_status.set(job_id, {"status": "processing", "progress": 75})
         
         # Save to database
         try:
@@ -283,61 +541,59 @@ async def process_resume(job_id: str, file_content: bytes, filename: str):
             )
             
             db.add(resume)
-            db.commit()
-            db.refresh(resume)
+            await db.commit()
             
-            print(f"Resume saved to database with ID: {resume.id}")
+            await cache_resume(job_id, resume.id, filename, parsed_data)
             
             # Update final status
-            parsing_status[job_id] = {
+            await parsing_status.set(job_id, {
                 "status": "completed",
                 "progress": 100,
                 "result": parsed_data,
                 "resume_id": resume.id
-            }
+            })
             
-            print(f"Job {job_id} completed successfully")
+            logger.info("Job %s completed: %s saved as resume %s", job_id, filename, resume.id)
             
         except Exception as db_error:
-            print(f"Database error: {str(db_error)}")
-            db.rollback()
+            logger.error("Database error for job %s: %s", job_id, db_error)
+            await db.rollback()
             
             # Still mark as completed but log the DB error
-            parsing_status[job_id] = {
+            await parsing_status.set(job_id, {
                 "status": "completed",
                 "progress": 100,
                 "result": parsed_data,
                 "db_error": str(db_error)
-            }
+            })
         
     except Exception as e:
-        print(f"Processing error: {str(e)}")
-        parsing_status[job_id] = {
+        logger.exception("Processing error for job %s: %s", job_id, e)
+        await parsing_status.set(job_id, {
             "status": "error",
             "progress": 0,
             "error": str(e)
-        }
-        db.rollback()
+        })
+        await db.rollback()
     
     finally:
-        db.close()
+        await db.close()
+        remove_temp_file(file_path)
 
 # Global storage for job analysis results
-job_analysis_results = {}
+job_analysis_results = StatusStore("job_analysis")
 
 @app.post("/upload-job-description")
 async def upload_job_description(
-    background_tasks: BackgroundTasks,
-    file: UploadFile = File(...)
+    file: UploadFile = File(...),
+    no_cache: bool = False
 ):
     """Upload and parse job description PDF using OpenAI"""
     
-    print("=== JOB DESCRIPTION UPLOAD RECEIVED ===")
-    print(f"Filename: {file.filename}")
-    print(f"Content type: {file.content_type}")
+    logger.debug("Job description upload received: %s (%s, %s bytes)", file.filename, file.content_type, file.size)
     
     # Validate file type
-    if not file.filename.lower().endswith('.pdf'):
+    if Path(file.filename).suffix.lower() != ".pdf":
         raise HTTPException(
             status_code=400,
             detail="Only PDF files are supported for job descriptions"
@@ -345,73 +601,120 @@ async def upload_job_description(
     
     # Generate job analysis ID
     analysis_id = str(uuid.uuid4())
-    job_analysis_results[analysis_id] = {"status": "processing", "progress": 0}
-    
-    print(f"Generated analysis ID: {analysis_id}")
+    await job_analysis_results.set(analysis_id, {"status": "processing", "progress": 0})
     
-    # Read file content
-    file_content = await file.read()
-    print(f"File content size: {len(file_content)} bytes")
+    # Stream file content to disk instead of holding it in memory
+    file_path = await save_upload_to_temp(file)
     
-    # Start background processing task
-    background_tasks.add_task(
+    # Queue background processing task
+    await enqueue_job(
+        "openai",
+        functools.partial(abandon_jobs, job_analysis_results, [analysis_id], [file_path]),
         process_job_description_task,
         analysis_id,
-        file_content,
-        file.filename
+        file_path,
+        file.filename,
+        no_cache
     )
     
-    print(f"Background task started for job analysis: {analysis_id}")
+    logger.info("Job description %s queued for analysis %s", file.filename, analysis_id)
     return {"analysis_id": analysis_id, "status": "processing"}
 
+@app.post("/upload-job-descriptions")
+async def upload_job_descriptions(
+    files: List[UploadFile] = File(...),
+    no_cache: bool = False
+):
+    """Upload several job description PDFs and parse them together in one OpenAI call"""
+    
+    logger.debug("%d job description uploads received", len(files))
+    
+    # Validate file types
+    for file in files:
+        if Path(file.filename).suffix.lower() != ".pdf":
+            raise HTTPException(
+                status_code=400,
+                detail=f"Only PDF files are supported for job descriptions: {file.filename}"
+            )
+    
+    # Generate one analysis ID per file
+    analysis_ids = [str(uuid.uuid4()) for _ in files]
+    for analysis_id in analysis_ids:
+        await job_analysis_results.set(analysis_id, {"status": "processing", "progress": 0})
+    
+    # Stream each file to disk instead of holding every upload in memory until the batch runs
+    staged_files = []
+    try:
+        for file in files:
+            staged_files.append((await save_upload_to_temp(file), file.filename))
+    except Exception:
+        for file_path, _ in staged_files:
+            remove_temp_file(file_path)
+        raise
+    
+    # Queue a single background task for the whole batch
+    await enqueue_job(
+        "openai",
+        functools.partial(abandon_jobs, job_analysis_results, analysis_ids, [file_path for file_path, _ in staged_files]),
+        process_job_descriptions_batch_task,
+        analysis_ids,
+        staged_files,
+        no_cache
+    )
+    
+    logger.info("%d job descriptions queued for analyses %s", len(files), analysis_ids)
+    return {"analysis_ids": analysis_ids, "status": "processing"}
+
 @app.get("/job-analysis-status/{analysis_id}")
 async def get_job_analysis_status(analysis_id: str):
     """Check the status of job description analysis"""
     
-    if analysis_id in job_analysis_results:
-        return job_analysis_results[analysis_id]
+    status_info = await job_analysis_results.get(analysis_id)
+    if status_info is not None:
+        return status_info
     
     return {"status": "not_found", "error": "Analysis ID not found"}
 
+def iter_resume_skills(skills):
+    """Yield skills from a flat list or from a dict of skill categories"""
+    if isinstance(skills, list):
+        yield from skills
+    elif isinstance(skills, dict):
+        # Handle different skill structures
+        for category_skills in skills.values():
+            if isinstance(category_skills, list):
+                yield from category_skills
+            elif isinstance(category_skills, str):
+                yield category_skills
+
 @app.post("/analyze-skills/{resume_job_id}/{analysis_id}")
 async def analyze_skills_match(
     resume_job_id: str,
-    analysis_id: str,
-    db: Session = Depends(get_db)
+    analysis_id: str
 ):
     """Analyze skill match between resume and job description"""
     
-    print(f"=== ANALYZING SKILLS MATCH ===")
-    print(f"Resume Job ID: {resume_job_id}")
-    print(f"Analysis ID: {analysis_id}")
+    logger.debug("Analyzing skills match for resume %s and analysis %s", resume_job_id, analysis_id)
     
     # Get resume data
-    resume = db.query(Resume).filter(Resume.user_session == resume_job_id).first()
+    resume = await get_resume_cached(resume_job_id)
     if not resume:
         raise HTTPException(status_code=404, detail="Resume not found")
     
     # Get job analysis data
-    if analysis_id not in job_analysis_results:
+    job_analysis = await job_analysis_results.get(analysis_id)
+    if job_analysis is None:
         raise HTTPException(status_code=404, detail="Job analysis not found")
     
-    job_analysis = job_analysis_results[analysis_id]
     if job_analysis["status"] != "completed":
         raise HTTPException(status_code=400, detail="Job analysis not completed yet")
     
     # Extract skills from resume
-    resume_data = resume.parsed_data if isinstance(resume.parsed_data, dict) else json.loads(resume.parsed_data)
-    resume_skills = []
-    
-    if "skills" in resume_data:
-        if isinstance(resume_data["skills"], list):
-            resume_skills = resume_data["skills"]
-        elif isinstance(resume_data["skills"], dict):
-            # Handle different skill structures
-            for category, skills in resume_data["skills"].items():
-                if isinstance(skills, list):
-                    resume_skills.extend(skills)
-                elif isinstance(skills, str):
-                    resume_skills.append(skills)
+    resume_data = resume["parsed_data"]
+    if isinstance(resume_data, (str, bytes)):
+        # Rows written as a JSON string before parsed_data was a native JSON column
+        resume_data = orjson.loads(resume_data)
+    resume_skills = list(iter_resume_skills(resume_data.get("skills")))
     
     # Get job requirements
     job_data = job_analysis["result"]["job_data"]
@@ -429,7 +732,7 @@ async def analyze_skills_match(
     result = {
         "resume_info": {
             "job_id": resume_job_id,
-            "filename": resume.filename,
+            "filename": resume["filename"],
             "skills": resume_skills
         },
         "job_info": {
@@ -443,7 +746,7 @@ async def analyze_skills_match(
         "recommendations": generate_recommendations(match_analysis)
     }
     
-    print(f"Skills match analysis completed. Overall match: {match_analysis['overall_match_percentage']}%")
+    logger.info("Skills match for resume %s and analysis %s: %s%%", resume_job_id, analysis_id, match_analysis['overall_match_percentage'])
     
     return result
 
@@ -451,15 +754,24 @@ async def analyze_skills_match(
 async def get_job_description(analysis_id: str):
     """Get parsed job description data"""
     
-    if analysis_id not in job_analysis_results:
+    job_analysis = await job_analysis_results.get(analysis_id)
+    if job_analysis is None:
         raise HTTPException(status_code=404, detail="Job analysis not found")
     
-    job_analysis = job_analysis_results[analysis_id]
     if job_analysis["status"] != "completed":
         raise HTTPException(status_code=400, detail="Job analysis not completed yet")
     
     return job_analysis["result"]
 
+# Overall assessment by match band - ASSESSMENT_THRESHOLDS[i] is where band i + 1 starts
+ASSESSMENT_THRESHOLDS = (40, 60, 80)
+ASSESSMENT_BANDS = (
+    "Limited match. Significant skill development needed for this role.",
+    "Fair match. Consider developing additional skills before applying.",
+    "Good match! You meet many requirements but could strengthen a few areas.",
+    "Excellent match! You have most of the required skills for this position.",
+)
+
 def generate_recommendations(match_analysis: dict) -> dict:
     """Generate recommendations based on skill match analysis"""
     
@@ -468,28 +780,15 @@ def generate_recommendations(match_analysis: dict) -> dict:
     missing_preferred = match_analysis["preferred_skills"]["missing"]
     
     recommendations = {
-        "overall_assessment": "",
-        "priority_skills": [],
-        "nice_to_have_skills": [],
+        # Overall assessment
+        "overall_assessment": ASSESSMENT_BANDS[bisect.bisect_right(ASSESSMENT_THRESHOLDS, overall_match)],
+        # Priority skills (missing required)
+        "priority_skills": missing_required[:5],  # Top 5
+        # Nice to have skills (missing preferred)
+        "nice_to_have_skills": missing_preferred[:5],  # Top 5
         "action_items": []
     }
     
-    # Overall assessment
-    if overall_match >= 80:
-        recommendations["overall_assessment"] = "Excellent match! You have most of the required skills for this position."
-    elif overall_match >= 60:
-        recommendations["overall_assessment"] = "Good match! You meet many requirements but could strengthen a few areas."
-    elif overall_match >= 40:
-        recommendations["overall_assessment"] = "Fair match. Consider developing additional skills before applying."
-    else:
-        recommendations["overall_assessment"] = "Limited match. Significant skill development needed for this role."
-    
-    # Priority skills (missing required)
-    recommendations["priority_skills"] = missing_required[:5]  # Top 5
-    
-    # Nice to have skills (missing preferred)
-    recommendations["nice_to_have_skills"] = missing_preferred[:5]  # Top 5
-    
     # Action items
     if missing_required:
         recommendations["action_items"].append(f"Focus on learning {len(missing_required)} missing required skills")
@@ -502,37 +801,77 @@ def generate_recommendations(match_analysis: dict) -> dict:
     
     return recommendations
 
-async def process_job_description_task(analysis_id: str, file_content: bytes, filename: str):
+async def process_job_description_task(analysis_id: str, file_path: str, filename: str, no_cache: bool = False):
     """Background task to process job description"""
     
     try:
-        job_analysis_results[analysis_id] = {"status": "processing", "progress": 25}
+        await job_analysis_results.set(analysis_id, {"status": "processing", "progress": 25})
         
         # Process the job description
-        result = await process_job_description(file_content, filename)
+        result = await process_job_description(file_path, filename, no_cache=no_cache)
         
         if result["success"]:
-            job_analysis_results[analysis_id] = {
+            await job_analysis_results.set(analysis_id, {
                 "status": "completed",
                 "progress": 100,
                 "result": result
-            }
-            print(f"Job description analysis completed for: {analysis_id}")
+            })
+            logger.info("Job description analysis completed for: %s", analysis_id)
         else:
-            job_analysis_results[analysis_id] = {
+            await job_analysis_results.set(analysis_id, {
                 "status": "error",
                 "progress": 0,
                 "error": result.get("error", "Unknown error")
-            }
-            print(f"Job description analysis failed for: {analysis_id}")
+            })
+            logger.warning("Job description analysis failed for: %s", analysis_id)
     
     except Exception as e:
-        print(f"Job description processing error: {str(e)}")
-        job_analysis_results[analysis_id] = {
+        logger.exception("Job description processing error: %s", e)
+        await job_analysis_results.set(analysis_id, {
             "status": "error",
             "progress": 0,
             "error": str(e)
-        }
+        })
+    
+    finally:
+        remove_temp_file(file_path)
+
+async def process_job_descriptions_batch_task(analysis_ids: List[str], staged_files: list, no_cache: bool = False):
+    """Background task to process several job descriptions together from their (file path, filename) pairs"""
+    
+    try:
+        for analysis_id in analysis_ids:
+            await job_analysis_results.set(analysis_id, {"status": "processing", "progress": 25})
+        
+        results = await process_job_descriptions_batch(staged_files, no_cache=no_cache)
+        
+        for analysis_id, result in zip(analysis_ids, results):
+            if result["success"]:
+                await job_analysis_results.set(analysis_id, {
+                    "status": "completed",
+                    "progress": 100,
+                    "result": result
+                })
+            else:
+                await job_analysis_results.set(analysis_id, {
+                    "status": "error",
+                    "progress": 0,
+                    "error": result.get("error", "Unknown error")
+                })
+        logger.info("Batch job description analysis finished for: %s", analysis_ids)
+    
+    except Exception as e:
+        logger.exception("Batch job description processing error: %s", e)
+        for analysis_id in analysis_ids:
+            await job_analysis_results.set(analysis_id, {
+                "status": "error",
+                "progress": 0,
+                "error": str(e)
+            })
+    
+    finally:
+        for file_path, _ in staged_files:
+            remove_temp_file(file_path)
 
 if __name__ == "__main__":
     import uvicorn
@@ -1,6 +1,7 @@
-from sqlalchemy import create_engine, Column, Integer, String, Text, DateTime, JSON, ForeignKey
+from sqlalchemy import create_engine, Column, Integer, String, Text, DateTime, JSON, ForeignKey, Index
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, relationship
+from sqlalchemy.dialects.postgresql import JSONB
 from datetime import datetime
 import os
 
@@ -12,13 +13,18 @@ class Resume(Base):
     id = Column(Integer, primary_key=True, index=True)
     filename = Column(String(255), nullable=False)
     upload_timestamp = Column(DateTime, default=datetime.utcnow)
-    parsed_data = Column(JSON, nullable=False)
+    parsed_data = Column(JSON().with_variant(JSONB(), "postgresql"), nullable=False)  # JSONB on Postgres, JSON elsewhere
     user_session = Column(String(255))
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     # Relationship with chat sessions
     chat_sessions = relationship("ChatSession", back_populates="resume", cascade="all, delete-orphan")
+    
+    __table_args__ = (
+        # Status and resume lookups by upload job ID
+        Index("idx_resumes_user_session", "user_session"),
+    )
 
 class ChatSession(Base):
     __tablename__ = "chat_sessions"
@@ -26,12 +32,13 @@ class ChatSession(Base):
     id = Column(Integer, primary_key=True, index=True)
     resume_id = Column(Integer, ForeignKey("resumes.id"), nullable=True)
     session_id = Column(String(255), nullable=False, unique=True, index=True)
+    message_count = Column(Integer, default=0, server_default="0", nullable=False)  # Highest message_order used
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     # Relationships
     resume = relationship("Resume", back_populates="chat_sessions")
-    messages = relationship("ChatMessage", back_populates="session", cascade="all, delete-orphan")
+    messages = relationship("ChatMessage", back_populates="session", order_by="ChatMessage.message_order", cascade="all, delete-orphan")
 
 class ChatMessage(Base):
     __tablename__ = "chat_messages"
@@ -46,3 +53,18 @@ class ChatMessage(Base):
     
     # Relationship
     session = relationship("ChatSession", back_populates="messages")
+    
+    __table_args__ = (
+        # Next message_order lookup and ordered history per session
+        Index("idx_chat_messages_order", "session_id", "message_order"),
+        # Last message time per session
+        Index("idx_chat_messages_session_timestamp", "session_id", "timestamp"),
+    )
+
+class ChatBatch(Base):
+    __tablename__ = "chat_batches"
+    
+    # Submitted OpenAI Batch API jobs whose replies haven't been saved yet
+    batch_id = Column(String(255), primary_key=True)
+    requests = Column(JSON().with_variant(JSONB(), "postgresql"), nullable=False)  # {session_id: {"message", "resume_id"}}
+    created_at = Column(DateTime, default=datetime.utcnow)
@@ -1,70 +1,90 @@
 import os
-import sys
-from pathlib import Path
-from typing import List, Dict, Any
-import json
+import random
+import logging
+import asyncio
+import functools
+import hashlib
+import re
+import orjson
+from typing import List, Dict, Any, AsyncIterator, Optional, Sequence, Tuple
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
-# Add current directory to path for imports
-current_dir = Path(__file__).parent
-sys.path.insert(0, str(current_dir))
+# Read once - an unset key is reported per request rather than failing the import
+OPENAI_API_KEY = (os.getenv("OPENAI_API_KEY") or "").strip()
 
+import httpx
 import openai
-from openai import OpenAI
+from openai import AsyncOpenAI
+from cachetools import LRUCache
+from schemas import ChatMessageSchema
+from semantic_cache import SEMANTIC_CACHE_ENABLED, resume_cache_scope, embed_message, lookup_response, store_response
 
-# Initialize OpenAI client
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+logger = logging.getLogger(__name__)
+logger.setLevel(os.getenv("LOG_LEVEL", "INFO"))
 
-async def get_chat_response(
-    message: str, 
-    resume_data: Dict[str, Any] = None, 
-    chat_history: List[Dict[str, Any]] = []
-) -> str:
+try:
+    import h2
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+OPENAI_TIMEOUT = httpx.Timeout(30.0, connect=5.0)
+
+# One persistent pool for every OpenAI call - concurrent chats multiplex over warm
+# HTTP/2 connections instead of paying a TLS handshake on cold ones
+http_client = httpx.AsyncClient(
+    http2=HTTP2_AVAILABLE,
+    limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+    timeout=OPENAI_TIMEOUT
+)
+
+# Initialize OpenAI client once - every request shares its connection pool.
+# The SDK doesn't retry; create_chat_completion does, with jittered backoff.
+client = AsyncOpenAI(
+    api_key=OPENAI_API_KEY,
+    max_retries=0,
+    timeout=OPENAI_TIMEOUT,
+    http_client=http_client
+)
+
+# Transient failures are retried with jittered backoff (about 1s, 2s, 4s) before falling back
+OPENAI_RETRY_ATTEMPTS = 4
+OPENAI_RETRY_MAX_WAIT = 8.0
+RETRYABLE_ERRORS = (openai.RateLimitError, openai.APITimeoutError, openai.InternalServerError)
+
+def retry_delay(error: Exception, attempt: int) -> float:
     """
-    Get chat response from OpenAI based on user message and resume context
+    Seconds to wait before the next attempt, honouring Retry-After when the API sends it
     """
-    
-    if not client.api_key:
-        raise ValueError("OPENAI_API_KEY environment variable is not set")
-    
-    # Build context from resume data
-    context = ""
-    if resume_data:
-        context = f"""
-Here is the resume data for context:
-
-Personal Information:
-- Name: {resume_data.get('personal_info', {}).get('full_name', 'N/A')}
-- Email: {resume_data.get('personal_info', {}).get('email', 'N/A')}
-- Phone: {resume_data.get('personal_info', {}).get('phone', 'N/A')}
-- Location: {resume_data.get('personal_info', {}).get('location', 'N/A')}
-
-Experience:
-"""
-        for exp in resume_data.get('experience', []):
-            context += f"- {exp.get('position', 'N/A')} at {exp.get('company', 'N/A')} ({exp.get('duration', 'N/A')})\n"
-        
-        context += f"\nEducation:\n"
-        for edu in resume_data.get('education', []):
-            context += f"- {edu.get('degree', 'N/A')} in {edu.get('field', 'N/A')} from {edu.get('institution', 'N/A')}\n"
-        
-        context += f"\nSkills: {', '.join(resume_data.get('skills', []))}\n"
-        
-        if resume_data.get('projects'):
-            context += f"\nProjects:\n"
-            for project in resume_data.get('projects', []):
-                context += f"- {project.get('name', 'N/A')}: {project.get('description', 'N/A')}\n"
-    
-    # Build conversation history
-    messages = [
-        {
-            "role": "system",
-            "content": f"""You are a helpful AI assistant that specializes in analyzing resumes and providing career advice. 
+    response = getattr(error, "response", None)
+    retry_after = response.headers.get("retry-after") if response is not None else None
+    if retry_after:
+        try:
+            return min(float(retry_after), OPENAI_RETRY_MAX_WAIT)
+        except ValueError:
+            pass
+    return min(2 ** attempt, OPENAI_RETRY_MAX_WAIT) * random.uniform(0.8, 1.2)
+
+async def create_chat_completion(**kwargs):
+    """
+    Start a chat completion, retrying rate limits, timeouts and server errors
+    """
+    for attempt in range(OPENAI_RETRY_ATTEMPTS):
+        try:
+            return await client.chat.completions.create(**kwargs)
+        except RETRYABLE_ERRORS as e:
+            # An exhausted quota won't come back in a few seconds
+            if attempt == OPENAI_RETRY_ATTEMPTS - 1 or getattr(e, "code", None) == "insufficient_quota":
+                raise
+            delay = retry_delay(e, attempt)
+            logger.warning("OpenAI API transient error (%s), retrying in %.1fs", type(e).__name__, delay)
+            await asyncio.sleep(delay)
 
-{context}
+# Instructions come first and never change, so every request shares the same prompt prefix
+CHAT_INSTRUCTIONS = """You are a helpful AI assistant that specializes in analyzing resumes and providing career advice. 
 
 You can help with:
 - Analyzing the resume for strengths and weaknesses
@@ -75,25 +95,165 @@ You can help with:
 - Career guidance and next steps
 
 Be conversational, helpful, and specific in your responses. Use the resume data to provide personalized advice."""
+
+# Instructions plus separator, ready to have a resume context appended
+SYSTEM_PREFIX = CHAT_INSTRUCTIONS + "\n\n"
+
+# Questions matching a known intent go to the small, fast model; open-ended ones to the stronger one
+SIMPLE_CHAT_MODEL = os.getenv("SIMPLE_CHAT_MODEL", "gpt-4o-mini")
+COMPLEX_CHAT_MODEL = os.getenv("COMPLEX_CHAT_MODEL", "gpt-4o")
+
+# Models a chat request may pin with model_override
+CHAT_MODELS = frozenset({SIMPLE_CHAT_MODEL, COMPLEX_CHAT_MODEL})
+
+# Most tokens of earlier conversation sent with each question - older messages are dropped first
+CHAT_HISTORY_TOKEN_BUDGET = int(os.getenv("CHAT_HISTORY_TOKEN_BUDGET", "2000"))
+
+@functools.lru_cache(maxsize=1)
+def get_token_encoder():
+    """
+    Get the tokenizer for the chat models, or None when tiktoken or its encoding isn't available
+    """
+    try:
+        import tiktoken
+        return tiktoken.encoding_for_model("gpt-4o-mini")
+    except Exception as e:
+        logger.warning("Tokenizer unavailable, estimating history tokens from length: %s", e)
+        return None
+
+def count_tokens(text: str) -> int:
+    """
+    Tokens in text, or roughly four characters per token without a tokenizer
+    """
+    encoder = get_token_encoder()
+    if encoder is None:
+        return len(text) // 4 + 1
+    return len(encoder.encode(text))
+
+def trim_chat_history(chat_history: Sequence[ChatMessageSchema], budget: int = CHAT_HISTORY_TOKEN_BUDGET) -> List[ChatMessageSchema]:
+    """
+    Keep the newest messages that fit in the token budget, in chronological order
+    """
+    kept = []
+    for chat in reversed(chat_history):
+        budget -= count_tokens(chat.content)
+        if budget < 0:
+            break
+        kept.append(chat)
+    kept.reverse()
+    return kept
+
+# Reply token budget by intent - short answers finish sooner when they don't reserve the full budget
+MAX_TOKENS_BY_INTENT = {
+    "greeting": 150,
+    "strength": 400,
+    "improve": 500,
+    "skill": 400,
+    "interview": 600,
+    "project": 500,
+    None: 1000,
+}
+
+# Deterministic (temperature 0) replies by a hash of the exact message list, so retries and
+# double-clicks are answered without another API call
+exact_response_cache = LRUCache(maxsize=4096)
+
+def exact_cache_key(model: str, messages: List[Dict[str, str]]) -> bytes:
+    """
+    Bounded cache key for an exact message list sent to a model
+    """
+    payload = orjson.dumps({"model": model, "messages": messages}, option=orjson.OPT_SORT_KEYS)
+    return hashlib.blake2b(payload, digest_size=16).digest()
+
+def route_chat_request(message: str, model_override: Optional[str] = None) -> Tuple[str, int]:
+    """
+    Pick the model and max_tokens for a message from its intent
+    """
+    intent = classify_intent(message)
+    model = model_override or (SIMPLE_CHAT_MODEL if intent else COMPLEX_CHAT_MODEL)
+    max_tokens = MAX_TOKENS_BY_INTENT.get(intent, 1000)
+    return model, max_tokens
+
+def build_system_content(resume_data: Dict[str, Any] = None) -> str:
+    """
+    Full system message for a resume, identical for identical resume data
+    """
+    if not resume_data:
+        return CHAT_INSTRUCTIONS
+    # Sorted keys give the same cache key however the dict was built
+    return render_system_content(orjson.dumps(resume_data, option=orjson.OPT_SORT_KEYS))
+
+@functools.lru_cache(maxsize=256)
+def render_system_content(resume_json: bytes) -> str:
+    """
+    Render the whole system message once per resume
+    """
+    return SYSTEM_PREFIX + render_resume_context(resume_json)
+
+def render_resume_context(resume_json: bytes) -> str:
+    """
+    Render the resume context block from sorted resume JSON, skipping empty fields
+    """
+    resume_data = orjson.loads(resume_json)
+    
+    # Fragments are collected and joined once instead of growing one string
+    parts = ["Here is the resume data for context:\n"]
+    
+    personal_info = resume_data.get('personal_info') or {}
+    personal_lines = [
+        f"- {label}: {personal_info[key]}\n"
+        for label, key in (("Name", "full_name"), ("Email", "email"), ("Phone", "phone"), ("Location", "location"))
+        if personal_info.get(key)
+    ]
+    if personal_lines:
+        parts.append("\nPersonal Information:\n")
+        parts.extend(personal_lines)
+    
+    if resume_data.get('experience'):
+        parts.append("\nExperience:\n")
+        parts.extend(
+            f"- {exp.get('position', 'N/A')} at {exp.get('company', 'N/A')} ({exp.get('duration', 'N/A')})\n"
+            for exp in resume_data['experience']
+        )
+    
+    if resume_data.get('education'):
+        parts.append("\nEducation:\n")
+        parts.extend(
+            f"- {edu.get('degree', 'N/A')} in {edu.get('field', 'N/A')} from {edu.get('institution', 'N/A')}\n"
+            for edu in resume_data['education']
+        )
+    
+    if resume_data.get('skills'):
+        parts.append(f"\nSkills: {', '.join(resume_data['skills'])}\n")
+    
+    if resume_data.get('projects'):
+        parts.append("\nProjects:\n")
+        parts.extend(
+            f"- {project.get('name', 'N/A')}: {project.get('description', 'N/A')}\n"
+            for project in resume_data['projects']
+        )
+    
+    return "".join(parts)
+
+def build_chat_messages(
+    message: str, 
+    resume_data: Dict[str, Any] = None, 
+    chat_history: Sequence[ChatMessageSchema] = ()
+) -> List[Dict[str, str]]:
+    """
+    Build the OpenAI message list from the resume context, chat history and user message
+    """
+    
+    # Static instructions, then the resume - chat history and the new message only come after
+    messages = [
+        {
+            "role": "system",
+            "content": build_system_content(resume_data)
         }
     ]
     
-    # Add chat history
-    for chat in chat_history[-10:]:  # Keep last 10 messages for context
-        # Handle both dict and ChatMessageSchema objects
-        if hasattr(chat, 'role'):
-            # ChatMessageSchema object
-            role = chat.role
-            content = chat.content
-        else:
-            # Dictionary
-            role = chat.get("role", "user")
-            content = chat.get("content", "")
-        
-        messages.append({
-            "role": role,
-            "content": content
-        })
+    # Add as much recent chat history as fits the token budget
+    messages.extend({"role": chat.role, "content": chat.content} for chat in trim_chat_history(chat_history))
     
     # Add current message
     messages.append({
@@ -101,101 +261,239 @@ Be conversational, helpful, and specific in your responses. Use the resume data
         "content": message
     })
     
+    return messages
+
+async def warm_openai_connection():
+    """
+    Open a pooled connection to OpenAI and load the tokenizer before the first chat request needs them
+    """
+    await asyncio.to_thread(get_token_encoder)
+    if not OPENAI_API_KEY:
+        return
+    try:
+        await client.models.list()
+        logger.info("OpenAI connection warmed up")
+    except Exception as e:
+        logger.warning("OpenAI warm-up failed: %s", e)
+
+async def get_chat_response(
+    message: str, 
+    resume_data: Dict[str, Any] = None, 
+    chat_history: Sequence[ChatMessageSchema] = (),
+    deterministic: bool = False,
+    model_override: Optional[str] = None
+) -> AsyncIterator[str]:
+    """
+    Stream the chat response from OpenAI as text chunks, as they are generated.
+    Deterministic calls run at temperature 0 and reuse the answer to an identical conversation.
+    The model is picked from the question's intent unless the caller pins one.
+    """
+    
+    if not OPENAI_API_KEY:
+        raise ValueError("OPENAI_API_KEY environment variable is not set")
+    
+    # Callers outside FastAPI may still pass plain dicts - coerce them once here
+    chat_history = tuple(
+        chat if isinstance(chat, ChatMessageSchema) else ChatMessageSchema(**chat)
+        for chat in chat_history
+    )
+    messages = build_chat_messages(message, resume_data, chat_history)
+    
+    model, max_tokens = route_chat_request(message, model_override)
+    temperature = 0 if deterministic else 0.7
+    
+    streamed_any = False
     try:
-        # Check if API key is available and valid
-        if not client.api_key or client.api_key.strip() == "":
-            print("OpenAI API key not available, using mock response")
-            return get_mock_chat_response(message, resume_data, chat_history)
+        # Identical deterministic calls get the same answer, so skip the API entirely
+        exact_key = exact_cache_key(model, messages) if deterministic else None
+        if exact_key is not None:
+            cached_response = exact_response_cache.get(exact_key)
+            if cached_response is not None:
+                logger.info("Chat response served from exact cache")
+                yield cached_response
+                return
+        
+        # Only opening questions about a resume are cached - later turns depend on the conversation
+        # so far, and questions without a resume would share answers between users. Pinned models
+        # are asked for explicitly, so they always get a fresh answer.
+        cache_scope = cache_vector = None
+        if SEMANTIC_CACHE_ENABLED and resume_data and not chat_history and not model_override:
+            try:
+                cache_scope = resume_cache_scope(resume_data, model, max_tokens, temperature)
+                cache_vector = await embed_message(client, message)
+                cached_response = lookup_response(cache_scope, cache_vector)
+                if cached_response is not None:
+                    logger.info("Chat response served from semantic cache")
+                    yield cached_response
+                    return
+            except Exception as e:
+                logger.warning("Semantic cache lookup failed: %s", e)
+                cache_vector = None
         
         # Make OpenAI API call
-        response = client.chat.completions.create(
-            model="gpt-3.5-turbo",
+        response = await create_chat_completion(
+            model=model,
             messages=messages,
-            max_tokens=1000,
-            temperature=0.7
+            max_tokens=max_tokens,
+            temperature=temperature,
+            stream=True
         )
         
-        return response.choices[0].message.content
+        parts = []
+        async for chunk in response:
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if delta:
+                streamed_any = True
+                parts.append(delta)
+                yield delta
         
-    except Exception as e:
-        # Log the error for debugging
-        print(f"OpenAI API error: {str(e)}")
+        # Mock fallbacks never get here, so only real answers are cached
+        if parts:
+            response_text = "".join(parts)
+            if exact_key is not None:
+                exact_response_cache[exact_key] = response_text
+            if cache_vector is not None:
+                store_response(cache_scope, cache_vector, response_text)
+        
+    # Only auth failures fall back to demo replies. Rate limits, timeouts and server errors that
+    # outlasted the retries reach the caller instead of passing demo text off as an answer.
+    except (openai.AuthenticationError, openai.PermissionDeniedError) as e:
+        logger.warning("OpenAI API auth error, falling back to mock response: %s", e)
         
-        # Check for various types of API errors and provide a mock response
-        error_msg = str(e).lower()
-        if any(term in error_msg for term in [
-            "quota", "insufficient_quota", "exceeded", "billing", "limit", 
-            "rate limit", "credits", "usage", "insufficient", "payment",
-            "authentication", "invalid api key", "unauthorized"
-        ]):
-            print("OpenAI API quota/auth issue detected, falling back to mock response")
-            return get_mock_chat_response(message, resume_data, chat_history)
-        else:
-            # For any other error, also fall back to mock response to keep the app working
-            print("OpenAI API error, falling back to mock response")
-            return get_mock_chat_response(message, resume_data, chat_history)
+        # A reply that already started streaming can't be swapped for the mock one
+        if streamed_any:
+            return
+        yield get_mock_chat_response(message, resume_data, chat_history)
+
+# Most chat completions a batch keeps in flight at once - keep it under the account's rate limits
+CHAT_BATCH_CONCURRENCY = int(os.getenv("CHAT_BATCH_CONCURRENCY", "8"))
+
+async def get_chat_responses_batch(
+    items: List[Tuple[str, Dict[str, Any], Sequence[ChatMessageSchema]]],
+    max_concurrency: int = CHAT_BATCH_CONCURRENCY
+) -> List[str]:
+    """
+    Get complete replies for several (message, resume_data, chat_history) items concurrently,
+    returned in the same order
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+    
+    async def one(message, resume_data, chat_history):
+        async with semaphore:
+            return "".join([delta async for delta in get_chat_response(message, resume_data, chat_history)])
+    
+    return await asyncio.gather(*(one(*item) for item in items))
+
+# Keywords for each mock reply intent, checked in order - the first intent with a matching word wins
+MOCK_INTENTS = {
+    "greeting": frozenset({"hello", "hi", "hey"}),
+    "strength": frozenset({"strength", "strengths", "strong", "strongest", "good", "positive"}),
+    "improve": frozenset({"improve", "improving", "improvement", "improvements", "better", "enhance", "weakness", "weaknesses"}),
+    "skill": frozenset({"skill", "skills", "technology", "technologies", "learn", "learning"}),
+    "interview": frozenset({"interview", "interviews", "prepare", "preparing", "question", "questions"}),
+    "project": frozenset({"project", "projects", "portfolio", "build", "building"}),
+}
+
+WORD_PATTERN = re.compile(r"\w+")
+
+def classify_intent(message: str) -> Optional[str]:
+    """
+    Return the first mock intent whose keywords appear in the message, or None
+    """
+    tokens = set(WORD_PATTERN.findall(message.lower()))
+    for intent, words in MOCK_INTENTS.items():
+        # Greetings only count for short messages - longer ones are real questions
+        if intent == "greeting" and len(message.split()) > 3:
+            continue
+        if tokens & words:
+            return intent
+    return None
+
+def mock_greeting(name: str, skills: List[str], experience_count: int, message: str) -> str:
+    return f"Hello! I'm here to help you analyze {name}'s resume and provide career guidance. I can see you have {len(skills)} technical skills listed and {experience_count} work experiences. What would you like to know about the resume or career development?"
+
+def mock_strength(name: str, skills: List[str], experience_count: int, message: str) -> str:
+    if not skills:
+        return "I'd be happy to analyze the strengths of this resume! Could you share the resume data so I can provide more specific feedback?"
+    top_skills = ", ".join(skills[:3]) + ("..." if len(skills) > 3 else "")
+    return f"Based on {name}'s resume, I can see several strengths:\n\n• **Technical Skills**: You have a solid foundation with {top_skills}\n• **Experience**: {experience_count} work experiences show professional growth\n• **Project Portfolio**: The projects demonstrate practical application of skills\n\nThese are valuable assets in today's competitive job market!"
+
+def mock_improve(name: str, skills: List[str], experience_count: int, message: str) -> str:
+    return f"Here are some areas where {name}'s resume could be enhanced:\n\n• **Skills Section**: Consider adding more specific technologies or frameworks\n• **Project Descriptions**: Include quantifiable results and impact\n• **Certifications**: Industry certifications can strengthen credibility\n• **Keywords**: Optimize for ATS systems with relevant industry terms\n\nWould you like me to elaborate on any of these areas?"
+
+def mock_skill(name: str, skills: List[str], experience_count: int, message: str) -> str:
+    return f"Based on current market trends and {name}'s background, I'd recommend focusing on:\n\n• **Cloud Technologies**: AWS, Azure, or Google Cloud\n• **DevOps Tools**: Docker, Kubernetes, CI/CD pipelines\n• **Modern Frameworks**: React, Node.js, or similar based on your field\n• **Data Skills**: SQL, Python for data analysis\n\nWhich area interests you most for skill development?"
+
+def mock_interview(name: str, skills: List[str], experience_count: int, message: str) -> str:
+    return f"Great question! Based on {name}'s background, here are key interview areas to prepare:\n\n• **Technical Questions**: Be ready to explain your projects in detail\n• **Behavioral Questions**: Prepare STAR method examples\n• **Problem-Solving**: Practice coding challenges or case studies\n• **Company Research**: Know the role requirements and company culture\n\nWould you like me to suggest specific questions for any of these areas?"
+
+def mock_project(name: str, skills: List[str], experience_count: int, message: str) -> str:
+    return f"Excellent! Building projects is crucial for career development. Here are project ideas that align with {name}'s skills:\n\n• **Full-Stack Application**: Combine frontend and backend technologies\n• **API Development**: Build and document a RESTful API\n• **Data Visualization**: Create interactive dashboards\n• **Open Source Contribution**: Contribute to existing projects\n\nFocus on projects that solve real problems and showcase your best skills!"
+
+def mock_default(name: str, skills: List[str], experience_count: int, message: str) -> str:
+    return f"I'm currently running in **demo mode** (OpenAI API not available), but I can still help analyze {name}'s resume!\n\nBased on your question: \"{message}\"\n\nI can provide guidance on:\n• Resume analysis and improvements\n• Skill recommendations  \n• Interview preparation tips\n• Project suggestions\n• Career development advice\n\n*Note: For full AI-powered responses, please check your OpenAI API configuration.*\n\nWhat specific aspect of the resume would you like me to focus on?"
+
+MOCK_HANDLERS = {
+    "greeting": mock_greeting,
+    "strength": mock_strength,
+    "improve": mock_improve,
+    "skill": mock_skill,
+    "interview": mock_interview,
+    "project": mock_project,
+    None: mock_default,
+}
 
 def get_mock_chat_response(
     message: str, 
     resume_data: Dict[str, Any] = None, 
-    chat_history: List[Dict[str, Any]] = []
+    chat_history: Sequence[ChatMessageSchema] = ()
 ) -> str:
     """
     Provide a mock response when OpenAI API is not available
     """
-    message_lower = message.lower()
-    
     # Get basic info from resume
     name = resume_data.get('personal_info', {}).get('full_name', 'your') if resume_data else 'your'
     skills = resume_data.get('skills', []) if resume_data else []
     experience_count = len(resume_data.get('experience', [])) if resume_data else 0
     
     # Generate contextual responses based on the message
-    if any(word in message_lower for word in ['hello', 'hi', 'hey']) and len(message.split()) <= 3:
-        return f"Hello! I'm here to help you analyze {name}'s resume and provide career guidance. I can see you have {len(skills)} technical skills listed and {experience_count} work experiences. What would you like to know about the resume or career development?"
-    
-    elif any(word in message_lower for word in ['strength', 'strong', 'good', 'positive']):
-        if skills:
-            return f"Based on {name}'s resume, I can see several strengths:\n\n• **Technical Skills**: You have a solid foundation with {', '.join(skills[:3])}{'...' if len(skills) > 3 else ''}\n• **Experience**: {experience_count} work experiences show professional growth\n• **Project Portfolio**: The projects demonstrate practical application of skills\n\nThese are valuable assets in today's competitive job market!"
-        else:
-            return "I'd be happy to analyze the strengths of this resume! Could you share the resume data so I can provide more specific feedback?"
-    
-    elif any(word in message_lower for word in ['improve', 'better', 'enhance', 'weakness']):
-        return f"Here are some areas where {name}'s resume could be enhanced:\n\n• **Skills Section**: Consider adding more specific technologies or frameworks\n• **Project Descriptions**: Include quantifiable results and impact\n• **Certifications**: Industry certifications can strengthen credibility\n• **Keywords**: Optimize for ATS systems with relevant industry terms\n\nWould you like me to elaborate on any of these areas?"
-    
-    elif any(word in message_lower for word in ['skill', 'technology', 'learn']):
-        return f"Based on current market trends and {name}'s background, I'd recommend focusing on:\n\n• **Cloud Technologies**: AWS, Azure, or Google Cloud\n• **DevOps Tools**: Docker, Kubernetes, CI/CD pipelines\n• **Modern Frameworks**: React, Node.js, or similar based on your field\n• **Data Skills**: SQL, Python for data analysis\n\nWhich area interests you most for skill development?"
-    
-    elif any(word in message_lower for word in ['interview', 'prepare', 'question']):
-        return f"Great question! Based on {name}'s background, here are key interview areas to prepare:\n\n• **Technical Questions**: Be ready to explain your projects in detail\n• **Behavioral Questions**: Prepare STAR method examples\n• **Problem-Solving**: Practice coding challenges or case studies\n• **Company Research**: Know the role requirements and company culture\n\nWould you like me to suggest specific questions for any of these areas?"
-    
-    elif any(word in message_lower for word in ['project', 'portfolio', 'build']):
-        return f"Excellent! Building projects is crucial for career development. Here are project ideas that align with {name}'s skills:\n\n• **Full-Stack Application**: Combine frontend and backend technologies\n• **API Development**: Build and document a RESTful API\n• **Data Visualization**: Create interactive dashboards\n• **Open Source Contribution**: Contribute to existing projects\n\nFocus on projects that solve real problems and showcase your best skills!"
-    
-    else:
-        return f"I'm currently running in **demo mode** (OpenAI API not available), but I can still help analyze {name}'s resume!\n\nBased on your question: \"{message}\"\n\nI can provide guidance on:\n• Resume analysis and improvements\n• Skill recommendations  \n• Interview preparation tips\n• Project suggestions\n• Career development advice\n\n*Note: For full AI-powered responses, please check your OpenAI API configuration.*\n\nWhat specific aspect of the resume would you like me to focus on?"
+    return MOCK_HANDLERS[classify_intent(message)](name, skills, experience_count, message)
 
-def get_suggested_questions(resume_data: Dict[str, Any]) -> List[str]:
+# Questions offered for every resume
+BASE_SUGGESTED_QUESTIONS = (
+    "What are the strongest points of this resume?",
+    "What skills should I add to be more competitive?",
+    "How can I improve my experience section?",
+    "What are some good interview questions I should prepare for?",
+    "How does my background compare to industry standards?"
+)
+
+@functools.lru_cache(maxsize=8)
+def suggested_questions_for(missing_certifications: bool, few_projects: bool, missing_github: bool) -> Tuple[str, ...]:
+    """
+    Suggested questions for each combination of resume gaps
+    """
+    suggestions = list(BASE_SUGGESTED_QUESTIONS)
+    if missing_certifications:
+        suggestions.append("What certifications would benefit my career?")
+    if few_projects:
+        suggestions.append("What projects should I build to strengthen my portfolio?")
+    if missing_github:
+        suggestions.append("How important is having a GitHub profile?")
+    return tuple(suggestions[:6])  # Return top 6 suggestions
+
+def get_suggested_questions(resume_data: Dict[str, Any]) -> Tuple[str, ...]:
     """
     Generate suggested questions based on resume data
     """
-    suggestions = [
-        "What are the strongest points of this resume?",
-        "What skills should I add to be more competitive?",
-        "How can I improve my experience section?",
-        "What are some good interview questions I should prepare for?",
-        "How does my background compare to industry standards?"
-    ]
-    
-    # Add specific suggestions based on resume content
-    if resume_data:
-        if not resume_data.get('certifications'):
-            suggestions.append("What certifications would benefit my career?")
-        
-        if len(resume_data.get('projects', [])) < 3:
-            suggestions.append("What projects should I build to strengthen my portfolio?")
-        
-        if not resume_data.get('personal_info', {}).get('github'):
-            suggestions.append("How important is having a GitHub profile?")
+    if not resume_data:
+        return suggested_questions_for(False, False, False)
     
-    return suggestions[:6]  # Return top 6 suggestions
+    # The suggestions only depend on which of these gaps the resume has
+    return suggested_questions_for(
+        not resume_data.get('certifications'),
+        len(resume_data.get('projects', [])) < 3,
+        not resume_data.get('personal_info', {}).get('github')
+    )
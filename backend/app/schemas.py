@@ -1,5 +1,5 @@
-from pydantic import BaseModel
-from typing import List, Dict, Any, Optional
+from pydantic import BaseModel, ConfigDict, field_validator
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
 
 class ResumeData(BaseModel):
@@ -21,16 +21,32 @@ class ResumeResponse(BaseModel):
 
 class ChatMessageSchema(BaseModel):
     """Schema for chat message in requests"""
+    model_config = ConfigDict(extra="ignore", populate_by_name=True)
+    
     role: str  # 'user' or 'assistant'
     content: str
 
 class ChatRequest(BaseModel):
     """Schema for chat request"""
+    model_config = ConfigDict(extra="ignore", populate_by_name=True)
+    
     message: str
     resume_data: Optional[Dict[str, Any]] = None
-    chat_history: List[ChatMessageSchema] = []
+    chat_history: Tuple[ChatMessageSchema, ...] = ()
     session_id: Optional[str] = None
     resume_id: Optional[int] = None
+    stream: bool = False  # Send the reply as Server-Sent Events
+    deterministic: bool = False  # Answer at temperature 0 and reuse identical answers
+    model_override: Optional[str] = None  # Pin one of the chat models instead of routing by intent
+    
+    @field_validator("model_override")
+    @classmethod
+    def check_model_override(cls, model: Optional[str]) -> Optional[str]:
+        """Only the models the server routes to may be pinned - anything else is rejected with 422"""
+        from openai_chat import CHAT_MODELS
+        if model is not None and model not in CHAT_MODELS:
+            raise ValueError(f"model_override must be one of: {', '.join(sorted(CHAT_MODELS))}")
+        return model
 
 class ChatResponse(BaseModel):
     """Schema for chat response"""
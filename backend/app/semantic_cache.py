@@ -0,0 +1,97 @@
+import os
+import sys
+import math
+import hashlib
+import operator
+from pathlib import Path
+from typing import Dict, Any, Optional, Tuple
+
+import orjson
+from cachetools import LRUCache
+from dotenv import load_dotenv
+
+# Add current directory to path for imports
+current_dir = Path(__file__).parent
+sys.path.insert(0, str(current_dir))
+
+load_dotenv()
+
+# Short embeddings keep the pure-Python similarity scan cheap
+SEMANTIC_CACHE_MODEL = "text-embedding-3-small"
+SEMANTIC_CACHE_DIMENSIONS = 256
+
+# The lookup costs one embeddings round-trip before every opening question's chat call -
+# SEMANTIC_CACHE_ENABLED=0 skips it where that matters more than the saved completions
+SEMANTIC_CACHE_ENABLED = os.getenv("SEMANTIC_CACHE_ENABLED", "1") == "1"
+
+# Cosine similarity a cached question needs to count as the same question
+SEMANTIC_CACHE_THRESHOLD = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.95"))
+
+# Cached answers kept per resume, and resumes kept overall
+SEMANTIC_CACHE_MAX_ENTRIES = 64
+SEMANTIC_CACHE_MAX_RESUMES = 1000
+
+# Normalized embedding by exact message text, so repeated strings skip the embedding call
+embedding_cache = LRUCache(maxsize=4096)
+
+# (normalized embedding, response) pairs by resume scope
+response_cache = LRUCache(maxsize=SEMANTIC_CACHE_MAX_RESUMES)
+
+def resume_cache_scope(resume_data: Dict[str, Any], model: str, max_tokens: int, temperature: float) -> str:
+    """
+    Stable key for a resume and completion settings, so cached answers are only reused
+    for the same resume asked through the same model
+    """
+    scope_json = orjson.dumps(
+        {"resume": resume_data, "model": model, "max_tokens": max_tokens, "temperature": temperature},
+        option=orjson.OPT_SORT_KEYS
+    )
+    return hashlib.blake2b(scope_json, digest_size=16).hexdigest()
+
+async def embed_message(client, message: str) -> Tuple[float, ...]:
+    """
+    Embed a chat message as a unit-length vector
+    """
+    cached = embedding_cache.get(message)
+    if cached is not None:
+        return cached
+
+    response = await client.embeddings.create(
+        model=SEMANTIC_CACHE_MODEL,
+        input=message,
+        dimensions=SEMANTIC_CACHE_DIMENSIONS
+    )
+    embedding = response.data[0].embedding
+    norm = math.sqrt(sum(value * value for value in embedding)) or 1.0
+    vector = tuple(value / norm for value in embedding)
+
+    embedding_cache[message] = vector
+    return vector
+
+def lookup_response(scope: str, vector: Tuple[float, ...]) -> Optional[str]:
+    """
+    Return the cached response for the most similar question, if it is similar enough
+    """
+    entries = response_cache.get(scope)
+    if not entries:
+        return None
+
+    # Vectors are unit length, so the dot product is the cosine similarity
+    best_score, best_response = max(
+        ((sum(map(operator.mul, vector, cached_vector)), response) for cached_vector, response in entries),
+        key=operator.itemgetter(0)
+    )
+    return best_response if best_score >= SEMANTIC_CACHE_THRESHOLD else None
+
+def store_response(scope: str, vector: Tuple[float, ...], response: str):
+    """
+    Remember a response for a question, dropping the oldest once the resume's cache is full
+    """
+    entries = response_cache.get(scope)
+    if entries is None:
+        entries = []
+        response_cache[scope] = entries
+
+    entries.append((vector, response))
+    if len(entries) > SEMANTIC_CACHE_MAX_ENTRIES:
+        del entries[0]
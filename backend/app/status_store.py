@@ -0,0 +1,71 @@
+import os
+import sys
+import logging
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+import orjson
+from cachetools import TTLCache
+from dotenv import load_dotenv
+
+# Add current directory to path for imports
+current_dir = Path(__file__).parent
+sys.path.insert(0, str(current_dir))
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+logger.setLevel(os.getenv("LOG_LEVEL", "INFO"))
+
+try:
+    import redis.asyncio as redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+# Redis URL shared by every API replica - status stays in process memory when unset
+REDIS_URL = os.getenv("REDIS_URL")
+
+# How long a job status record is kept after its last update
+STATUS_TTL_SECONDS = int(os.getenv("STATUS_TTL_SECONDS", "3600"))
+
+# Most records kept per store when status lives in process memory
+STATUS_MAX_ENTRIES = int(os.getenv("STATUS_MAX_ENTRIES", "10000"))
+
+redis_client = None
+if REDIS_AVAILABLE and REDIS_URL:
+    redis_client = redis.Redis.from_url(REDIS_URL)
+    logger.info("Job status stored in Redis")
+else:
+    logger.info("Job status stored in process memory")
+
+class StatusStore:
+    """
+    JSON records keyed by job ID, stored in Redis when available
+    """
+
+    def __init__(self, prefix: str, ttl: int = STATUS_TTL_SECONDS, max_entries: int = STATUS_MAX_ENTRIES):
+        self.prefix = prefix
+        self.ttl = ttl
+        # Without Redis, old records expire and the oldest are evicted once the store is full.
+        # Only the event loop touches it, so no lock is needed.
+        self.local = TTLCache(maxsize=max_entries, ttl=ttl)
+
+    async def set(self, job_id: str, payload: Dict[str, Any]):
+        if redis_client is None:
+            self.local[job_id] = payload
+            return
+        await redis_client.set(f"{self.prefix}:{job_id}", orjson.dumps(payload), ex=self.ttl)
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        if redis_client is None:
+            return self.local.get(job_id)
+        payload = await redis_client.get(f"{self.prefix}:{job_id}")
+        return orjson.loads(payload) if payload is not None else None
+
+async def close_status_store():
+    """
+    Close the Redis connection pool, if status lives in Redis
+    """
+    if redis_client is not None:
+        await redis_client.aclose()
@@ -1,9 +1,16 @@
 import os
 import sys
-import json
-import tempfile
+import re
+import time
+import asyncio
+import hashlib
+import logging
+import functools
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+import ahocorasick
+import orjson
+from cachetools import LRUCache
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -13,110 +20,350 @@ load_dotenv()
 current_dir = Path(__file__).parent
 sys.path.insert(0, str(current_dir))
 
-try:
-    from vlmrun.client import VLMRun
-    VLM_AVAILABLE = True
-    print("✅ VLM.run SDK imported successfully!")
-except ImportError as e:
-    print(f"❌ VLM.run SDK not available: {e}")
-    print("Using mock data")
-    VLM_AVAILABLE = False
+logger = logging.getLogger(__name__)
+logger.setLevel(os.getenv("LOG_LEVEL", "INFO"))
 
-async def parse_resume_with_vlm(file_content: bytes, filename: str) -> Dict[str, Any]:
+# The VLM.run SDK and PIL are imported on first use, so start-up and reloads
+# don't pay for them until a resume actually needs the VLM
+@functools.lru_cache(maxsize=1)
+def get_vlm_client(api_key: str):
     """
-    Parse resume using VLM.run SDK
+    Get the shared VLM.run client, or None if the SDK isn't installed
     """
+    try:
+        from vlmrun.client import VLMRun
+    except ImportError as e:
+        logger.warning("VLM.run SDK not available, using mock data: %s", e)
+        return None
+    
+    os.environ["VLMRUN_API_KEY"] = api_key
+    logger.info("VLM.run SDK imported")
+    return VLMRun()
+
+@functools.lru_cache(maxsize=1)
+def get_image_module():
+    """
+    Get PIL's Image module
+    """
+    from PIL import Image
+    return Image
+
+# A page with less text than this is treated as scanned and needs the VLM
+MIN_TEXT_LAYER_CHARS_PER_PAGE = 100
+
+# The text layer is only considered for the whole resume when it is at least this long
+MIN_TEXT_LAYER_CHARS = 500
+
+# RESUME_TEXT_FAST_PATH=1 lets native PDFs whose text parses into a full resume skip the VLM.
+# Off by default: the text parser finds fewer skills than the VLM and no projects,
+# certifications, languages or location.
+RESUME_TEXT_FAST_PATH = os.getenv("RESUME_TEXT_FAST_PATH") == "1"
+
+# Contact details in resume text, compiled once
+EMAIL_PATTERN = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b')
+PHONE_PATTERN = re.compile(r'(?:\+?1[-.\s]?)?\(?[0-9]{3}\)?[-.\s]?[0-9]{3}[-.\s]?[0-9]{4}')
+LINKEDIN_PATTERN = re.compile(r'(?:https?://)?(?:[a-z]{2,3}\.)?linkedin\.com/in/[A-Za-z0-9_-]+/?', re.IGNORECASE)
+GITHUB_PATTERN = re.compile(r'(?:https?://)?github\.com/[A-Za-z0-9_-]+/?', re.IGNORECASE)
+
+# Tech terms picked out of plain resume text, in the order they are reported
+SKILL_KEYWORDS = ('python', 'javascript', 'react', 'node', 'sql', 'aws', 'docker', 'git', 'java', 'css', 'html')
+
+# One pass over the text finds every keyword, instead of one substring scan per keyword
+SKILL_KEYWORD_AUTOMATON = ahocorasick.Automaton()
+for keyword in SKILL_KEYWORDS:
+    SKILL_KEYWORD_AUTOMATON.add_word(keyword, keyword)
+SKILL_KEYWORD_AUTOMATON.make_automaton()
+
+# Section headings in plain resume text - None marks a section that is recognised but not parsed
+TEXT_SECTION_HEADINGS = {
+    "experience": "experience",
+    "work experience": "experience",
+    "professional experience": "experience",
+    "employment": "experience",
+    "employment history": "experience",
+    "work history": "experience",
+    "education": "education",
+    "academic background": "education",
+    "summary": None,
+    "profile": None,
+    "objective": None,
+    "skills": None,
+    "technical skills": None,
+    "projects": None,
+    "certifications": None,
+    "languages": None,
+    "awards": None,
+    "publications": None,
+    "interests": None,
+    "references": None,
+    "volunteer experience": None,
+}
+
+# Date ranges like "Jan 2020 - Present" or "2016 – 2019", and single years
+MONTH_PREFIX = r'(?:(?:jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)[a-z]*\.?\s+)?'
+DATE_RANGE_PATTERN = re.compile(
+    MONTH_PREFIX + r'(?:19|20)\d{2}\s*(?:-|–|—|to)\s*(?:' + MONTH_PREFIX + r'(?:19|20)\d{2}|present|current|now)\b',
+    re.IGNORECASE
+)
+YEAR_PATTERN = re.compile(r'\b(?:19|20)\d{2}\b')
+GPA_PATTERN = re.compile(r'\bGPA[:\s]*([0-4]\.\d{1,2})', re.IGNORECASE)
+
+# Separators between a title and its organisation on one line, tried in order
+TITLE_SEPARATORS = re.compile(r'\s+at\s+|\s*\|\s*|\s+[-–—]\s+|,\s+')
+BULLET_CHARS = '•●▪◦·*-–'
+
+# Most VLM.run calls in flight at once across all uploads
+MAX_CONCURRENT_VLM_TASKS = int(os.getenv("MAX_CONCURRENT_VLM_TASKS", "10"))
+vlm_semaphore = asyncio.Semaphore(MAX_CONCURRENT_VLM_TASKS)
+
+# Parsed VLM results by SHA-256 of the uploaded file, so a re-uploaded resume skips the VLM call.
+# Results expire after VLM_CACHE_TTL_SECONDS and only the newest VLM_CACHE_MAX_FILES are kept on disk.
+VLM_CACHE_DIR = Path(os.getenv("VLM_CACHE_DIR", "~/.cache/nymph/vlm")).expanduser()
+VLM_CACHE_TTL_SECONDS = int(os.getenv("VLM_CACHE_TTL_SECONDS", str(7 * 24 * 60 * 60)))
+VLM_CACHE_MAX_FILES = int(os.getenv("VLM_CACHE_MAX_FILES", "1000"))
+VLM_CACHE_CHUNK_SIZE = 1 << 20
+
+# Most recent results also kept in memory with their expiry time, as JSON so callers can't change the cached copy
+vlm_memory_cache = LRUCache(maxsize=256)
+
+def file_sha256(file_path: str) -> str:
+    """
+    SHA-256 of a file, read in chunks
+    """
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(VLM_CACHE_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def read_vlm_cache(key: str) -> Optional[bytes]:
+    """
+    Cached result JSON for a file hash from memory or disk, or None if missing or expired
+    """
+    now = time.time()
+    entry = vlm_memory_cache.get(key)
+    if entry is not None:
+        expires_at, cached = entry
+        if expires_at > now:
+            return cached
+        del vlm_memory_cache[key]
+    
+    cache_path = VLM_CACHE_DIR / f"{key}.json"
+    try:
+        expires_at = cache_path.stat().st_mtime + VLM_CACHE_TTL_SECONDS
+        if expires_at <= now:
+            cache_path.unlink(missing_ok=True)
+            return None
+        cached = cache_path.read_bytes()
+    except FileNotFoundError:
+        return None
+    vlm_memory_cache[key] = (expires_at, cached)
+    return cached
+
+def prune_vlm_cache():
+    """
+    Delete expired cache files, then the oldest ones beyond VLM_CACHE_MAX_FILES
+    """
+    expired_before = time.time() - VLM_CACHE_TTL_SECONDS
+    files = []
+    for path in VLM_CACHE_DIR.glob("*.json"):
+        try:
+            mtime = path.stat().st_mtime
+        except FileNotFoundError:
+            continue
+        if mtime <= expired_before:
+            path.unlink(missing_ok=True)
+        else:
+            files.append((mtime, path))
+    
+    files.sort(reverse=True)
+    for _, path in files[VLM_CACHE_MAX_FILES:]:
+        path.unlink(missing_ok=True)
+
+def write_vlm_cache(key: str, resume_data: Dict[str, Any]):
+    """
+    Store a parsed result in memory and on disk
+    """
+    cached = orjson.dumps(resume_data)
+    vlm_memory_cache[key] = (time.time() + VLM_CACHE_TTL_SECONDS, cached)
+    try:
+        VLM_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        # Write then rename so a concurrent reader never sees half a file
+        tmp_path = VLM_CACHE_DIR / f"{key}.json.tmp"
+        tmp_path.write_bytes(cached)
+        tmp_path.replace(VLM_CACHE_DIR / f"{key}.json")
+        prune_vlm_cache()
+    except OSError as e:
+        logger.warning("Could not write VLM cache: %s", e)
+
+def extract_pdf_text_layer(file_path: str) -> Optional[str]:
+    """
+    Read the PDF text layer page by page, or return None if any page looks scanned
+    """
+    import fitz  # PyMuPDF
+    
+    try:
+        with fitz.open(file_path, filetype="pdf") as doc:
+            pages = []
+            for page in doc:
+                text = page.get_text("text")
+                if len(text.strip()) < MIN_TEXT_LAYER_CHARS_PER_PAGE:
+                    return None
+                pages.append(text)
+        return "\n".join(pages) if pages else None
+    except Exception as e:
+        logger.warning("Could not read PDF text layer: %s", e)
+        return None
+
+def is_complete_text_parse(resume_data: Dict[str, Any]) -> bool:
+    """
+    Whether a text-layer parse found enough to stand in for the VLM: a contact email plus
+    at least one job with position and company or one degree with its institution
+    """
+    return bool(resume_data["personal_info"]["email"]) and (
+        any(job["position"] and job["company"] for job in resume_data["experience"])
+        or any(school["degree"] and school["institution"] for school in resume_data["education"])
+    )
+
+def log_vlm_response(response):
+    """Log a VLM.run response's status, type and attributes at debug level"""
+    if not logger.isEnabledFor(logging.DEBUG):
+        return
+    logger.debug("VLM.run response status: %s", getattr(response, 'status', 'unknown'))
+    logger.debug("VLM.run response type: %s", type(response))
+    logger.debug("VLM.run response attributes: %s", [attr for attr in dir(response) if not attr.startswith('_')])
+
+async def parse_resume_with_vlm(file_path: str, filename: str) -> Dict[str, Any]:
+    """
+    Parse resume using VLM.run SDK from an uploaded file saved at file_path
+    """
+    
+    # Native PDFs whose text parses into a full resume don't need the VLM - anything else falls through to it
+    if RESUME_TEXT_FAST_PATH and filename.lower().endswith('.pdf'):
+        text_content = await asyncio.to_thread(extract_pdf_text_layer, file_path)
+        if text_content and len(text_content) >= MIN_TEXT_LAYER_CHARS:
+            text_resume = extract_resume_from_text(text_content)
+            if is_complete_text_parse(text_resume):
+                logger.info("Parsed resume from PDF text layer: %s", filename)
+                return text_resume
     
     # Check if VLM is available and API key is set
     vlm_api_key = os.getenv("VLMRUN_API_KEY") or os.getenv("VLM_API_KEY")
     
-    if not VLM_AVAILABLE or not vlm_api_key:
-        print("Warning: VLM.run SDK not available or API key not set, using mock data")
+    if not vlm_api_key:
+        logger.warning("VLM.run API key not set, using mock data")
         return get_mock_resume_data()
     
+    # Identical files have already been through the VLM
+    cache_key = await asyncio.to_thread(file_sha256, file_path)
+    cached = await asyncio.to_thread(read_vlm_cache, cache_key)
+    if cached is not None:
+        logger.info("Resume served from VLM cache: %s", filename)
+        return orjson.loads(cached)
+    
     try:
         # Initialize VLM client
-        os.environ["VLMRUN_API_KEY"] = vlm_api_key
-        client = VLMRun()
+        client = get_vlm_client(vlm_api_key)
+        if client is None:
+            return get_mock_resume_data()
         
-        print(f"Processing resume with VLM.run: {filename}")
+        logger.info("Processing resume with VLM.run: %s", filename)
         
         try:
             # For PDF documents, use document.generate with file path
             if filename.lower().endswith('.pdf'):
-                print(f"Processing PDF document: {filename}")
-                
-                # Save file content to temporary file for VLM processing
-                with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as temp_file:
-                    temp_file.write(file_content)
-                    temp_file_path = temp_file.name
+                logger.debug("Processing PDF document: %s", filename)
                 
-                try:
-                    # Use the document.resume domain with file path (as Path object)
-                    from pathlib import Path
-                    response = client.document.generate(
-                        file=Path(temp_file_path),  # Pass file path as Path object
+                # The upload is already on disk - the caller removes it when done.
+                # The SDK call blocks, so it runs in a thread to keep the event loop free.
+                async with vlm_semaphore:
+                    response = await asyncio.to_thread(
+                        client.document.generate,
+                        file=Path(file_path),  # Pass file path as Path object
                         domain="document.resume"
                     )
-                    
-                    print(f"VLM.run response status: {getattr(response, 'status', 'unknown')}")
-                    print(f"VLM.run response type: {type(response)}")
-                    print(f"VLM.run response attributes: {[attr for attr in dir(response) if not attr.startswith('_')]}")
-                    
-                finally:
-                    # Always clean up temp file
-                    if os.path.exists(temp_file_path):
-                        os.unlink(temp_file_path)
+                
+                log_vlm_response(response)
                 
             else:
                 # For images or other formats, try image processing
-                print(f"Processing as image: {filename}")
-                from PIL import Image
-                import io
-                
-                # Convert file content to PIL Image
-                image = Image.open(io.BytesIO(file_content))
-                response = client.image.generate(
-                    images=[image],
-                    domain="document.resume"
-                )
+                logger.debug("Processing as image: %s", filename)
+                # Open the uploaded file as a PIL Image
+                image = get_image_module().open(file_path)
+                async with vlm_semaphore:
+                    response = await asyncio.to_thread(
+                        client.image.generate,
+                        images=[image],
+                        domain="document.resume"
+                    )
                 
-                print(f"VLM.run response status: {getattr(response, 'status', 'unknown')}")
-                print(f"VLM.run response type: {type(response)}")
-                print(f"VLM.run response attributes: {[attr for attr in dir(response) if not attr.startswith('_')]}")
+                log_vlm_response(response)
             
             # Check if processing completed
             if hasattr(response, 'status') and response.status == "completed":
-                print("VLM processing completed successfully!")
+                logger.debug("VLM processing completed")
                 # Extract structured data from response
                 if hasattr(response, 'response'):
                     resume_data = response.response
-                    print(f"VLM response data type: {type(resume_data)}")
-                    print(f"VLM response data preview: {str(resume_data)[:500]}...")
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug("VLM response data type: %s", type(resume_data))
+                        logger.debug("VLM response data preview: %s...", str(resume_data)[:500])
                     
                     # Convert VLM response to our expected format
                     structured_data = convert_vlm_response_to_resume_format(resume_data)
-                    print("Successfully parsed resume with VLM.run!")
+                    logger.info("Parsed resume with VLM.run: %s", filename)
+                    
+                    # The conversion falls back to mock data on failure - never cache that
+                    if structured_data != MOCK_RESUME_DATA:
+                        await asyncio.to_thread(write_vlm_cache, cache_key, structured_data)
                     return structured_data
                 else:
-                    print("VLM response completed but no data returned, using mock data")
+                    logger.warning("VLM response completed but no data returned, using mock data")
                     return get_mock_resume_data()
             else:
-                print(f"VLM processing status: {getattr(response, 'status', 'unknown')}")
-                print(f"VLM response attributes: {[attr for attr in dir(response) if not attr.startswith('_')]}")
-                print("Using mock data due to non-completed status")
+                log_vlm_response(response)
+                logger.warning("VLM processing status %s, using mock data", getattr(response, 'status', 'unknown'))
                 return get_mock_resume_data()
                 
         except Exception as e:
-            print(f"VLM API error: {e}")
-            print("Falling back to mock data")
+            logger.exception("VLM API error, falling back to mock data: %s", e)
             return get_mock_resume_data()
             
     except Exception as e:
-        print(f"VLM API error: {e}")
-        print("Falling back to mock data")
+        logger.exception("VLM API error, falling back to mock data: %s", e)
         return get_mock_resume_data()
 
+# Where each personal_info field comes from in a VLM response - key paths tried in order
+PERSONAL_INFO_SOURCES = {
+    "full_name": (("contact_info", "full_name"), ("name",), ("applicant_name",)),
+    "email": (("contact_info", "email"), ("email",), ("email_address",)),
+    "phone": (("contact_info", "phone"), ("phone",), ("phone_number",), ("contact_number",)),
+    "location": (("contact_info", "address"), ("contact_info", "location"), ("location",), ("address",), ("city",)),
+    "linkedin": (("contact_info", "linkedin"), ("linkedin",), ("linkedin_url",)),
+    "github": (("contact_info", "github"), ("github",), ("github_url",)),
+    "portfolio": (("contact_info", "portfolio"), ("contact_info", "website"), ("website",), ("portfolio",)),
+}
+
+def pick_field(data: Dict[str, Any], paths) -> Any:
+    """First non-empty value found along the key paths, or an empty string"""
+    for path in paths:
+        value = data
+        for key in path:
+            value = value.get(key) if isinstance(value, dict) else None
+        if value:
+            return value
+    return ""
+
+@functools.lru_cache(maxsize=32)
+def response_fields(cls) -> tuple:
+    """
+    Names of the data fields of a VLM response class, looked up once per class
+    """
+    fields = getattr(cls, 'model_fields', None) or getattr(cls, '__dataclass_fields__', None)
+    if fields:
+        return tuple(fields)
+    return tuple(attr for attr in dir(cls) if not attr.startswith('_') and not callable(getattr(cls, attr, None)))
+
 def convert_vlm_response_to_resume_format(vlm_data) -> Dict[str, Any]:
     """
     Convert VLM.run response to our expected resume format
@@ -125,45 +372,39 @@ def convert_vlm_response_to_resume_format(vlm_data) -> Dict[str, Any]:
     # We'll try to extract and normalize it to our schema
     
     try:
-        print(f"Converting VLM data: {type(vlm_data)}")
+        logger.debug("Converting VLM data: %s", type(vlm_data))
         
         # If vlm_data is already a dict, use it directly
         if isinstance(vlm_data, dict):
             data = vlm_data
+        elif hasattr(vlm_data, 'model_dump'):
+            # Pydantic models dump themselves, nested models included
+            data = vlm_data.model_dump()
         elif hasattr(vlm_data, '__dict__'):
             # Try to convert object to dict
             data = vlm_data.__dict__
         else:
-            # Try to extract attributes from the response object
+            # Read the public data attributes of the response class
             data = {}
-            for attr in dir(vlm_data):
-                if not attr.startswith('_') and not callable(getattr(vlm_data, attr)):
-                    try:
-                        data[attr] = getattr(vlm_data, attr)
-                    except:
-                        continue
+            for attr in response_fields(type(vlm_data)):
+                try:
+                    data[attr] = getattr(vlm_data, attr)
+                except Exception:
+                    continue
         
-        print(f"Extracted data keys: {list(data.keys()) if isinstance(data, dict) else 'Not a dict'}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Extracted data keys: %s", list(data.keys()) if isinstance(data, dict) else 'Not a dict')
         
         # Handle the VLM.run structured response format
         if isinstance(data, dict) and 'contact_info' in data:
             # This is the structured VLM response format
             contact_info = data.get('contact_info', {})
             
-            print(f"DEBUG: contact_info = {contact_info}")
-            print(f"DEBUG: data keys = {list(data.keys())}")
+            logger.debug("contact_info = %s", contact_info)
             
             # Map VLM response to our resume format
             resume_data = {
-                "personal_info": {
-                    "full_name": contact_info.get("full_name") or data.get("name") or data.get("applicant_name") or "",
-                    "email": contact_info.get("email") or data.get("email") or data.get("email_address") or "",
-                    "phone": contact_info.get("phone") or data.get("phone") or data.get("phone_number") or data.get("contact_number") or "",
-                    "location": contact_info.get("address") or contact_info.get("location") or data.get("location") or data.get("address") or data.get("city") or "",
-                    "linkedin": contact_info.get("linkedin") or data.get("linkedin") or data.get("linkedin_url") or "",
-                    "github": contact_info.get("github") or data.get("github") or data.get("github_url") or "",
-                    "portfolio": contact_info.get("portfolio") or contact_info.get("website") or data.get("website") or data.get("portfolio") or ""
-                },
+                "personal_info": {field: pick_field(data, paths) for field, paths in PERSONAL_INFO_SOURCES.items()},
                 "experience": extract_experience(data),
                 "education": extract_education(data),
                 "skills": extract_skills(data),
@@ -172,11 +413,10 @@ def convert_vlm_response_to_resume_format(vlm_data) -> Dict[str, Any]:
                 "languages": extract_languages(data)
             }
             
-            print(f"DEBUG: mapped personal_info = {resume_data['personal_info']}")
-            print(f"DEBUG: mapped skills = {resume_data['skills'][:5] if resume_data['skills'] else 'No skills'}")
-            print(f"DEBUG: raw technical_skills = {data.get('technical_skills', 'Not found')}")
-            print(f"VLM parsing completed. Data type: {type(data)}")
-            print(f"Parsed data keys: {list(resume_data.keys())}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("mapped personal_info = %s", resume_data['personal_info'])
+                logger.debug("mapped skills = %s", resume_data['skills'][:5] if resume_data['skills'] else 'No skills')
+                logger.debug("raw technical_skills = %s", data.get('technical_skills', 'Not found'))
             
             # Check if we got any meaningful data
             has_data = any([
@@ -188,10 +428,10 @@ def convert_vlm_response_to_resume_format(vlm_data) -> Dict[str, Any]:
             ])
             
             if has_data:
-                print("Successfully converted VLM response to resume format")
+                logger.debug("Converted VLM response to resume format")
                 return resume_data
             else:
-                print("No meaningful data extracted from VLM response, using mock data")
+                logger.warning("No meaningful data extracted from VLM response, using mock data")
                 return get_mock_resume_data()
         
         # If the data looks like it might contain extracted text, try to parse it
@@ -201,51 +441,155 @@ def convert_vlm_response_to_resume_format(vlm_data) -> Dict[str, Any]:
             
             # If we have text content, try to extract resume information from it
             if text_content and isinstance(text_content, str) and len(text_content) > 50:
-                print(f"Found text content: {text_content[:200]}...")
+                logger.debug("Found text content: %s...", text_content[:200])
                 # For now, return a basic structure with the text - later we can enhance this
                 return extract_resume_from_text(text_content)
         
-        print("No structured data found, using mock data")
+        logger.warning("No structured data found, using mock data")
         return get_mock_resume_data()
         
     except Exception as e:
-        print(f"Error converting VLM response: {e}")
+        logger.exception("Error converting VLM response: %s", e)
         return get_mock_resume_data()
 
+# Resumes already parsed from text, as JSON bytes keyed by a digest of the text
+text_resume_cache = LRUCache(maxsize=512)
+
 def extract_resume_from_text(text_content: str) -> Dict[str, Any]:
     """
-    Extract resume information from raw text content
+    Extract resume information from raw text content, reusing the result for text seen before
+    """
+    cache_key = hashlib.blake2b(text_content.encode(), digest_size=16).digest()
+    cached = text_resume_cache.get(cache_key)
+    if cached is None:
+        cached = orjson.dumps(parse_resume_text(text_content))
+        text_resume_cache[cache_key] = cached
+    # Each caller gets its own copy to modify
+    return orjson.loads(cached)
+
+def split_text_sections(text_content: str) -> Dict[str, list]:
+    """
+    Lines under each experience/education heading of plain resume text
+    """
+    sections = {"experience": [], "education": []}
+    current = None
+    for line in text_content.split('\n'):
+        heading = line.strip().rstrip(':').lower()
+        if heading in TEXT_SECTION_HEADINGS:
+            current = TEXT_SECTION_HEADINGS[heading]
+        elif current is not None:
+            sections[current].append(line.strip())
+    return sections
+
+def split_text_entries(lines: list) -> list:
+    """
+    Group section lines into entries - a blank line, or a plain line after bullet points, starts a new one
     """
-    import re
+    entries = []
+    current = []
+    for line in lines:
+        is_bullet = line[:1] in BULLET_CHARS if line else False
+        if not line or (not is_bullet and any(entry_line[:1] in BULLET_CHARS for entry_line in current)):
+            if current:
+                entries.append(current)
+            current = [line] if line else []
+        else:
+            current.append(line)
+    if current:
+        entries.append(current)
+    return entries
+
+def parse_experience_entry(lines: list) -> Dict[str, Any]:
+    """
+    One work experience entry from its lines of text
+    """
+    duration_match = next((match for match in map(DATE_RANGE_PATTERN.search, lines) if match), None)
+    header = []
+    achievements = []
+    for line in lines:
+        if line[:1] in BULLET_CHARS:
+            achievements.append(line.lstrip(BULLET_CHARS + ' '))
+            continue
+        line = DATE_RANGE_PATTERN.sub('', line).strip(' ,|-–—')
+        if line:
+            header.append(line)
     
-    # Basic extraction patterns
-    email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-    phone_pattern = r'(?:\+?1[-.\s]?)?\(?[0-9]{3}\)?[-.\s]?[0-9]{3}[-.\s]?[0-9]{4}'
+    parts = TITLE_SEPARATORS.split(header[0], maxsplit=1) if header else [""]
+    position = parts[0].strip()
+    company = parts[1].strip() if len(parts) > 1 else (header[1] if len(header) > 1 else "")
+    used = 1 if len(parts) > 1 else 2
+    return {
+        "position": position,
+        "company": company,
+        "duration": duration_match.group() if duration_match else "",
+        "description": " ".join(header[used:]),
+        "achievements": achievements
+    }
+
+def parse_education_entry(lines: list) -> Dict[str, Any]:
+    """
+    One education entry from its lines of text
+    """
+    text = " ".join(lines)
+    years = YEAR_PATTERN.findall(text)
+    gpa_match = GPA_PATTERN.search(text)
+    header = [
+        line for line in (
+            YEAR_PATTERN.sub('', DATE_RANGE_PATTERN.sub('', line.lstrip(BULLET_CHARS + ' '))).strip(' ,|-–—')
+            for line in lines if not GPA_PATTERN.search(line)
+        ) if line
+    ]
     
+    parts = TITLE_SEPARATORS.split(header[0], maxsplit=1) if header else [""]
+    return {
+        "degree": parts[0].strip(),
+        "field": "",
+        "institution": parts[1].strip() if len(parts) > 1 else (header[1] if len(header) > 1 else ""),
+        "graduation_year": years[-1] if years else "",
+        "gpa": gpa_match.group(1) if gpa_match else ""
+    }
+
+def is_whole_word(text: str, start: int, end: int) -> bool:
+    """
+    Whether text[start:end] is not part of a longer word
+    """
+    return (start == 0 or not text[start - 1].isalnum()) and (end == len(text) or not text[end].isalnum())
+
+def parse_resume_text(text_content: str) -> Dict[str, Any]:
+    """
+    Extract resume information from raw text content
+    """
     # Extract email
-    emails = re.findall(email_pattern, text_content)
-    email = emails[0] if emails else ""
+    email_match = EMAIL_PATTERN.search(text_content)
+    email = email_match.group() if email_match else ""
     
     # Extract phone
-    phones = re.findall(phone_pattern, text_content)
-    phone = phones[0] if phones else ""
+    phone_match = PHONE_PATTERN.search(text_content)
+    phone = phone_match.group() if phone_match else ""
     
     # Try to extract name (first line that's not email/phone)
-    lines = text_content.split('\n')
+    # Only the first 5 lines are checked, so don't split the rest of the document
+    lines = text_content.split('\n', 5)[:5]
     name = ""
-    for line in lines[:5]:  # Check first 5 lines
+    for line in lines:
         line = line.strip()
-        if line and not re.search(email_pattern, line) and not re.search(phone_pattern, line) and len(line.split()) <= 4:
+        if line and not EMAIL_PATTERN.search(line) and not PHONE_PATTERN.search(line) and len(line.split()) <= 4:
             name = line
             break
     
-    # Basic skills extraction (look for common tech terms)
-    skill_keywords = ['python', 'javascript', 'react', 'node', 'sql', 'aws', 'docker', 'git', 'java', 'css', 'html']
-    found_skills = []
+    # Basic skills extraction (look for common tech terms as whole words, so "git" doesn't match "github")
     text_lower = text_content.lower()
-    for skill in skill_keywords:
-        if skill in text_lower:
-            found_skills.append(skill.title())
+    matched = {
+        keyword for end, keyword in SKILL_KEYWORD_AUTOMATON.iter(text_lower)
+        if is_whole_word(text_lower, end - len(keyword) + 1, end + 1)
+    }
+    found_skills = [skill.title() for skill in SKILL_KEYWORDS if skill in matched]
+    
+    # Experience and education entries under their headings
+    sections = split_text_sections(text_content)
+    
+    linkedin_match = LINKEDIN_PATTERN.search(text_content)
+    github_match = GITHUB_PATTERN.search(text_content)
     
     return {
         "personal_info": {
@@ -253,263 +597,262 @@ def extract_resume_from_text(text_content: str) -> Dict[str, Any]:
             "email": email,
             "phone": phone,
             "location": "",
-            "linkedin": "",
-            "github": "",
+            "linkedin": linkedin_match.group() if linkedin_match else "",
+            "github": github_match.group() if github_match else "",
             "website": ""
         },
-        "experience": [],
-        "education": [],
+        "experience": [parse_experience_entry(entry) for entry in split_text_entries(sections["experience"])],
+        "education": [parse_education_entry(entry) for entry in split_text_entries(sections["education"])],
         "skills": found_skills,
         "projects": [],
         "certifications": [],
         "languages": []
     }
 
-def extract_experience(data) -> list:
-    """Extract work experience from VLM response"""
-    experience = data.get("experience") or data.get("work_experience") or data.get("employment") or []
+# Where each resume section comes from in a VLM response: the synonym keys holding the list,
+# then (output field, synonym keys tried in order, default) for each item
+SECTION_SPECS = {
+    "experience": {
+        "sources": ("experience", "work_experience", "employment"),
+        "fields": (
+            ("position", ("position", "title", "job_title", "role"), ""),
+            ("company", ("company", "employer", "organization"), ""),
+            ("duration", ("duration", "dates", "period"), ""),
+            ("description", ("description", "responsibilities", "summary"), ""),
+            ("achievements", ("achievements", "accomplishments"), []),
+        ),
+    },
+    "education": {
+        "sources": ("education", "academic_background"),
+        "fields": (
+            ("degree", ("degree", "qualification"), ""),
+            ("field", ("field", "major", "subject", "field_of_study"), ""),
+            ("institution", ("institution", "school", "university"), ""),
+            ("graduation_year", ("year", "graduation_year", "graduation_date"), ""),
+            ("gpa", ("gpa", "grade"), ""),
+        ),
+    },
+    "projects": {
+        "sources": ("projects", "portfolio"),
+        "fields": (
+            ("name", ("name", "title", "project_name"), ""),
+            ("description", ("description", "summary", "details"), ""),
+            ("technologies", ("technologies", "tech_stack", "tools"), []),
+            ("url", ("url", "link", "github", "github_url"), ""),
+        ),
+    },
+    "certifications": {
+        "sources": ("certifications", "certificates"),
+        "fields": (
+            ("name", ("name", "title", "certification"), ""),
+            ("issuer", ("issuer", "organization", "provider"), ""),
+            ("date", ("date", "year", "issued_date"), ""),
+        ),
+        # Plain strings are just the certification name
+        "from_string": lambda cert: {"name": cert, "issuer": "", "date": ""},
+    },
+    "languages": {
+        "sources": ("languages",),
+        "fields": (
+            ("language", ("language", "name"), ""),
+            ("proficiency", ("proficiency", "level", "fluency"), ""),
+        ),
+        "from_string": lambda lang: {"language": lang, "proficiency": "Not specified"},
+    },
+}
+
+def extract_section(data, section: str) -> list:
+    """Map one list section of a VLM response onto our field names using SECTION_SPECS"""
+    spec = SECTION_SPECS[section]
+    items = next((data[key] for key in spec["sources"] if data.get(key)), [])
     
-    if not isinstance(experience, list):
+    if not isinstance(items, list):
         return []
     
-    formatted_exp = []
-    for exp in experience:
-        if isinstance(exp, dict):
-            # Safe string concatenation with None checks
-            start_date = exp.get("start_date") or ""
-            end_date = exp.get("end_date") or ""
-            duration = exp.get("duration") or exp.get("dates") or exp.get("period") or ""
-            
-            # Only concatenate dates if both exist
-            if start_date and end_date and not duration:
-                duration = f"{start_date} - {end_date}"
-            
-            formatted_exp.append({
-                "position": exp.get("position") or exp.get("title") or exp.get("job_title") or exp.get("role") or "",
-                "company": exp.get("company") or exp.get("employer") or exp.get("organization") or "",
-                "duration": duration,
-                "description": exp.get("description") or exp.get("responsibilities") or exp.get("summary") or "",
-                "achievements": exp.get("achievements") or exp.get("accomplishments") or []
+    from_string = spec.get("from_string")
+    formatted = []
+    for item in items:
+        if isinstance(item, dict):
+            formatted.append({
+                field: next((item[key] for key in keys if item.get(key)), None) or (default.copy() if isinstance(default, list) else default)
+                for field, keys, default in spec["fields"]
             })
+        elif from_string is not None and isinstance(item, str):
+            formatted.append(from_string(item))
+    
+    return formatted
+
+def extract_experience(data) -> list:
+    """Extract work experience from VLM response"""
+    formatted_exp = extract_section(data, "experience")
+    if not formatted_exp:
+        return formatted_exp
+    
+    # Only concatenate dates if both exist and there's no duration
+    experience = next(data[key] for key in SECTION_SPECS["experience"]["sources"] if data.get(key))
+    for exp, formatted in zip((item for item in experience if isinstance(item, dict)), formatted_exp):
+        start_date = exp.get("start_date") or ""
+        end_date = exp.get("end_date") or ""
+        if start_date and end_date and not formatted["duration"]:
+            formatted["duration"] = f"{start_date} - {end_date}"
     
     return formatted_exp
 
 def extract_education(data) -> list:
     """Extract education from VLM response"""
-    education = data.get("education") or data.get("academic_background") or []
-    
-    if not isinstance(education, list):
-        return []
-    
-    formatted_edu = []
-    for edu in education:
-        if isinstance(edu, dict):
-            formatted_edu.append({
-                "degree": edu.get("degree") or edu.get("qualification") or "",
-                "field": edu.get("field") or edu.get("major") or edu.get("subject") or edu.get("field_of_study") or "",
-                "institution": edu.get("institution") or edu.get("school") or edu.get("university") or "",
-                "graduation_year": edu.get("year") or edu.get("graduation_year") or edu.get("graduation_date") or "",
-                "gpa": edu.get("gpa") or edu.get("grade") or ""
-            })
-    
-    return formatted_edu
+    return extract_section(data, "education")
+
+def category_skill_names(skill_list) -> list:
+    """Skill names from one category of a categorized skills dict"""
+    if isinstance(skill_list, list):
+        # If skill is an object with name/level, extract the name
+        return [
+            (skill.get('name') or skill.get('skill') or str(skill)) if isinstance(skill, dict) else str(skill)
+            for skill in skill_list
+        ]
+    if isinstance(skill_list, str):
+        return [s.strip() for s in skill_list.split(',') if s.strip()]
+    return []
+
+def skill_name(skill) -> str:
+    """Name of one entry of a skills list"""
+    if isinstance(skill, str):
+        return skill.strip()
+    if isinstance(skill, dict):
+        # Sometimes skills come as objects with name/level/years_of_experience
+        return skill.get('name') or skill.get('skill') or skill.get('technology') or str(skill)
+    return str(skill)
 
 def extract_skills(data) -> list:
     """Extract skills from VLM response"""
     # VLM.run returns technical_skills
     skills = data.get("skills") or data.get("technical_skills") or data.get("competencies") or []
     
-    # If technical_skills is a dict with categories, flatten it
+    # Skills repeated across categories are kept once, in first-seen order
+    # If technical_skills is a dict with categories, flatten it in one pass
     if isinstance(skills, dict):
-        all_skills = []
-        for category, skill_list in skills.items():
-            if isinstance(skill_list, list):
-                for skill in skill_list:
-                    if isinstance(skill, dict):
-                        # If skill is an object with name/level, extract the name
-                        skill_name = skill.get('name') or skill.get('skill') or str(skill)
-                        all_skills.append(skill_name)
-                    else:
-                        all_skills.append(str(skill))
-            elif isinstance(skill_list, str):
-                all_skills.extend([s.strip() for s in skill_list.split(',') if s.strip()])
-        return all_skills
+        return list(dict.fromkeys(skill for skill_list in skills.values() for skill in category_skill_names(skill_list)))
     elif isinstance(skills, str):
         # If skills is a string, split by common separators
-        return [skill.strip() for skill in skills.replace(',', '\n').replace(';', '\n').split('\n') if skill.strip()]
+        return list(dict.fromkeys(skill.strip() for skill in skills.replace(',', '\n').replace(';', '\n').split('\n') if skill.strip()))
     elif isinstance(skills, list):
         # If it's already a list, clean it up
-        flattened_skills = []
-        for skill in skills:
-            if isinstance(skill, str):
-                flattened_skills.append(skill.strip())
-            elif isinstance(skill, dict):
-                # Sometimes skills come as objects with name/level/years_of_experience
-                skill_name = skill.get('name') or skill.get('skill') or skill.get('technology') or str(skill)
-                flattened_skills.append(skill_name)
-            else:
-                flattened_skills.append(str(skill))
-        return [skill for skill in flattened_skills if skill and skill != 'None']
+        return list(dict.fromkeys(name for name in map(skill_name, skills) if name and name != 'None'))
     
     return []
 
 def extract_projects(data) -> list:
     """Extract projects from VLM response"""
-    projects = data.get("projects") or data.get("portfolio") or []
-    
-    if not isinstance(projects, list):
-        return []
+    formatted_projects = extract_section(data, "projects")
     
-    formatted_projects = []
-    for proj in projects:
-        if isinstance(proj, dict):
-            # Extract technologies list
-            tech_list = proj.get("technologies") or proj.get("tech_stack") or proj.get("tools") or []
-            if isinstance(tech_list, str):
-                tech_list = [t.strip() for t in tech_list.split(',') if t.strip()]
-            
-            formatted_projects.append({
-                "name": proj.get("name") or proj.get("title") or proj.get("project_name") or "",
-                "description": proj.get("description") or proj.get("summary") or proj.get("details") or "",
-                "technologies": tech_list,
-                "url": proj.get("url") or proj.get("link") or proj.get("github") or proj.get("github_url") or ""
-            })
+    # Technologies sometimes come as one comma-separated string
+    for proj in formatted_projects:
+        if isinstance(proj["technologies"], str):
+            proj["technologies"] = [t.strip() for t in proj["technologies"].split(',') if t.strip()]
     
     return formatted_projects
 
 def extract_certifications(data) -> list:
     """Extract certifications from VLM response"""
-    certs = data.get("certifications") or data.get("certificates") or []
-    
-    if not isinstance(certs, list):
-        return []
-    
-    formatted_certs = []
-    for cert in certs:
-        if isinstance(cert, dict):
-            formatted_certs.append({
-                "name": cert.get("name") or cert.get("title") or cert.get("certification") or "",
-                "issuer": cert.get("issuer") or cert.get("organization") or cert.get("provider") or "",
-                "date": cert.get("date") or cert.get("year") or cert.get("issued_date") or ""
-            })
-        elif isinstance(cert, str):
-            formatted_certs.append({
-                "name": cert,
-                "issuer": "",
-                "date": ""
-            })
-    
-    return formatted_certs
+    return extract_section(data, "certifications")
 
 def extract_languages(data) -> list:
     """Extract languages from VLM response"""
-    languages = data.get("languages") or []
-    
-    if not isinstance(languages, list):
-        return []
-    
-    formatted_langs = []
-    for lang in languages:
-        if isinstance(lang, dict):
-            formatted_langs.append({
-                "language": lang.get("language") or lang.get("name") or "",
-                "proficiency": lang.get("proficiency") or lang.get("level") or lang.get("fluency") or ""
-            })
-        elif isinstance(lang, str):
-            formatted_langs.append({
-                "language": lang,
-                "proficiency": "Not specified"
-            })
-    
-    return formatted_langs
+    return extract_section(data, "languages")
+
+# Built once - callers get their own copy through get_mock_resume_data
+MOCK_RESUME_DATA = {
+    "personal_info": {
+        "full_name": "Sarah Johnson",
+        "email": "sarah.johnson@email.com",
+        "phone": "+1-555-0123",
+        "location": "San Francisco, CA",
+        "linkedin": "linkedin.com/in/sarahjohnson",
+        "github": "github.com/sarahjohnson",
+        "portfolio": "sarahjohnson.dev"
+    },
+    "experience": [
+        {
+            "company": "Tech Innovations Inc",
+            "position": "Senior Software Engineer",
+            "duration": "2022 - Present",
+            "description": "Lead development of scalable web applications using React, Node.js, and AWS cloud services. Mentor junior developers and collaborate with cross-functional teams.",
+            "achievements": [
+                "Improved application performance by 40% through code optimization",
+                "Led a team of 5 developers on a major product redesign",
+                "Implemented CI/CD pipeline reducing deployment time by 60%"
+            ]
+        },
+        {
+            "company": "StartupXYZ",
+            "position": "Full Stack Developer",
+            "duration": "2020 - 2022",
+            "description": "Developed and maintained full-stack applications using Python/Django and React. Worked in fast-paced startup environment.",
+            "achievements": [
+                "Built MVP from scratch serving 10,000+ users",
+                "Reduced API response time by 50%"
+            ]
+        }
+    ],
+    "education": [
+        {
+            "institution": "University of California, Berkeley",
+            "degree": "Bachelor of Science",
+            "field": "Computer Science",
+            "graduation_year": "2020",
+            "gpa": "3.8"
+        }
+    ],
+    "skills": [
+        "Python", "JavaScript", "React", "Node.js", "Django", "FastAPI", 
+        "PostgreSQL", "MongoDB", "AWS", "Docker", "Git", "TypeScript",
+        "REST APIs", "GraphQL", "Redis", "Kubernetes"
+    ],
+    "certifications": [
+        {
+            "name": "AWS Solutions Architect Associate",
+            "issuer": "Amazon Web Services",
+            "date": "2023"
+        },
+        {
+            "name": "Certified Kubernetes Administrator",
+            "issuer": "Cloud Native Computing Foundation",
+            "date": "2022"
+        }
+    ],
+    "projects": [
+        {
+            "name": "AI Resume Parser",
+            "description": "Full-stack application that uses AI to parse resumes and provide career insights. Built with Next.js, FastAPI, and OpenAI API.",
+            "technologies": ["Next.js", "TypeScript", "FastAPI", "Python", "OpenAI API", "PostgreSQL"],
+            "url": "github.com/sarahjohnson/ai-resume-parser"
+        },
+        {
+            "name": "E-commerce Platform",
+            "description": "Scalable e-commerce solution with real-time inventory management and payment processing.",
+            "technologies": ["React", "Node.js", "Express", "MongoDB", "Stripe API"],
+            "url": "github.com/sarahjohnson/ecommerce-platform"
+        }
+    ],
+    "languages": [
+        {
+            "language": "English",
+            "proficiency": "Native"
+        },
+        {
+            "language": "Spanish",
+            "proficiency": "Conversational"
+        },
+        {
+            "language": "French",
+            "proficiency": "Basic"
+        }
+    ]
+}
+
+# Decoding the JSON is a faster deep copy than copy.deepcopy for plain JSON data
+MOCK_RESUME_JSON = orjson.dumps(MOCK_RESUME_DATA)
 
 def get_mock_resume_data() -> Dict[str, Any]:
     """Mock resume data for testing"""
-    return {
-        "personal_info": {
-            "full_name": "Sarah Johnson",
-            "email": "sarah.johnson@email.com",
-            "phone": "+1-555-0123",
-            "location": "San Francisco, CA",
-            "linkedin": "linkedin.com/in/sarahjohnson",
-            "github": "github.com/sarahjohnson",
-            "portfolio": "sarahjohnson.dev"
-        },
-        "experience": [
-            {
-                "company": "Tech Innovations Inc",
-                "position": "Senior Software Engineer",
-                "duration": "2022 - Present",
-                "description": "Lead development of scalable web applications using React, Node.js, and AWS cloud services. Mentor junior developers and collaborate with cross-functional teams.",
-                "achievements": [
-                    "Improved application performance by 40% through code optimization",
-                    "Led a team of 5 developers on a major product redesign",
-                    "Implemented CI/CD pipeline reducing deployment time by 60%"
-                ]
-            },
-            {
-                "company": "StartupXYZ",
-                "position": "Full Stack Developer",
-                "duration": "2020 - 2022",
-                "description": "Developed and maintained full-stack applications using Python/Django and React. Worked in fast-paced startup environment.",
-                "achievements": [
-                    "Built MVP from scratch serving 10,000+ users",
-                    "Reduced API response time by 50%"
-                ]
-            }
-        ],
-        "education": [
-            {
-                "institution": "University of California, Berkeley",
-                "degree": "Bachelor of Science",
-                "field": "Computer Science",
-                "graduation_year": "2020",
-                "gpa": "3.8"
-            }
-        ],
-        "skills": [
-            "Python", "JavaScript", "React", "Node.js", "Django", "FastAPI", 
-            "PostgreSQL", "MongoDB", "AWS", "Docker", "Git", "TypeScript",
-            "REST APIs", "GraphQL", "Redis", "Kubernetes"
-        ],
-        "certifications": [
-            {
-                "name": "AWS Solutions Architect Associate",
-                "issuer": "Amazon Web Services",
-                "date": "2023"
-            },
-            {
-                "name": "Certified Kubernetes Administrator",
-                "issuer": "Cloud Native Computing Foundation",
-                "date": "2022"
-            }
-        ],
-        "projects": [
-            {
-                "name": "AI Resume Parser",
-                "description": "Full-stack application that uses AI to parse resumes and provide career insights. Built with Next.js, FastAPI, and OpenAI API.",
-                "technologies": ["Next.js", "TypeScript", "FastAPI", "Python", "OpenAI API", "PostgreSQL"],
-                "url": "github.com/sarahjohnson/ai-resume-parser"
-            },
-            {
-                "name": "E-commerce Platform",
-                "description": "Scalable e-commerce solution with real-time inventory management and payment processing.",
-                "technologies": ["React", "Node.js", "Express", "MongoDB", "Stripe API"],
-                "url": "github.com/sarahjohnson/ecommerce-platform"
-            }
-        ],
-        "languages": [
-            {
-                "language": "English",
-                "proficiency": "Native"
-            },
-            {
-                "language": "Spanish",
-                "proficiency": "Conversational"
-            },
-            {
-                "language": "French",
-                "proficiency": "Basic"
-            }
-        ]
-    }
+    return orjson.loads(MOCK_RESUME_JSON)
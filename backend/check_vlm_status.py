@@ -1,12 +1,17 @@
 import os
 import time
 import tempfile
+import requests
 from pathlib import Path
 from dotenv import load_dotenv
+from vlm_config import get_vlm_api_key, vlm_api_key_redacted
 from datetime import datetime
 
 load_dotenv()
 
+# Reused across checks so repeated runs keep the TLS connection alive
+session = requests.Session()
+
 def check_vlm_api_status():
     """Check if VLM API key is fully activated"""
     
@@ -15,12 +20,12 @@ def check_vlm_api_status():
     try:
         from vlmrun.client import VLMRun
         
-        vlm_api_key = os.getenv('VLMRUN_API_KEY') or os.getenv('VLM_API_KEY')
+        vlm_api_key = get_vlm_api_key()
         if not vlm_api_key:
             print("❌ No API key found in environment")
             return False
             
-        print(f"🔑 Using API key: {vlm_api_key[:10]}...{vlm_api_key[-5:]}")
+        print(f"🔑 Using API key: {vlm_api_key_redacted()}")
         
         # Test 1: Basic client initialization
         os.environ['VLMRUN_API_KEY'] = vlm_api_key
@@ -28,9 +33,8 @@ def check_vlm_api_status():
         print("✅ Client initialization: SUCCESS")
         
         # Test 2: Health check
-        import requests
         headers = {'Authorization': f'Bearer {vlm_api_key}'}
-        health_response = requests.get('https://api.vlm.run/v1/health', headers=headers, timeout=10)
+        health_response = session.get('https://api.vlm.run/v1/health', headers=headers, timeout=10)
         
         if health_response.status_code == 200:
             print("✅ Health check: SUCCESS")
@@ -66,8 +70,7 @@ def check_vlm_api_status():
             return False
             
         finally:
-            if os.path.exists(temp_file_path):
-                os.unlink(temp_file_path)
+            Path(temp_file_path).unlink(missing_ok=True)
                 
     except ImportError:
         print("❌ VLMRun SDK not installed")
@@ -0,0 +1,24 @@
+"""
+Shared fixtures for the VLM.run test scripts
+"""
+
+import os
+import pytest
+from dotenv import load_dotenv
+from vlm_testing import TEST_PDF_BYTES, make_vlm_session
+
+load_dotenv()
+
+@pytest.fixture(scope="session")
+def vlm_session():
+    """One VLM.run session shared by every test module"""
+    session = make_vlm_session()
+    yield session
+    session.close()
+
+@pytest.fixture(scope="session")
+def test_pdf_path(tmp_path_factory):
+    """TEST_PDF_BYTES written to disk once and shared by every test that uploads a file"""
+    path = tmp_path_factory.mktemp("vlm") / "test_resume.pdf"
+    path.write_bytes(TEST_PDF_BYTES)
+    return path
@@ -16,6 +16,7 @@ CREATE TABLE IF NOT EXISTS chat_sessions (
     id SERIAL PRIMARY KEY,
     resume_id INTEGER REFERENCES resumes(id) ON DELETE CASCADE,
     session_id VARCHAR(255) NOT NULL UNIQUE,
+    message_count INTEGER NOT NULL DEFAULT 0,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
@@ -31,6 +32,19 @@ CREATE TABLE IF NOT EXISTS chat_messages (
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
+-- Table for OpenAI batch jobs whose replies haven't been saved yet
+CREATE TABLE IF NOT EXISTS chat_batches (
+    batch_id VARCHAR(255) PRIMARY KEY,
+    requests JSONB NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Add the message counter to databases created before it existed and backfill it
+ALTER TABLE chat_sessions ADD COLUMN IF NOT EXISTS message_count INTEGER NOT NULL DEFAULT 0;
+UPDATE chat_sessions SET message_count = m.max_order
+FROM (SELECT session_id, MAX(message_order) AS max_order FROM chat_messages GROUP BY session_id) m
+WHERE m.session_id = chat_sessions.session_id AND chat_sessions.message_count = 0;
+
 -- Indexes for better performance
 CREATE INDEX IF NOT EXISTS idx_resumes_user_session ON resumes(user_session);
 CREATE INDEX IF NOT EXISTS idx_resumes_upload_timestamp ON resumes(upload_timestamp);
@@ -39,6 +53,7 @@ CREATE INDEX IF NOT EXISTS idx_chat_sessions_session_id ON chat_sessions(session
 CREATE INDEX IF NOT EXISTS idx_chat_messages_session_id ON chat_messages(session_id);
 CREATE INDEX IF NOT EXISTS idx_chat_messages_timestamp ON chat_messages(timestamp);
 CREATE INDEX IF NOT EXISTS idx_chat_messages_order ON chat_messages(session_id, message_order);
+CREATE INDEX IF NOT EXISTS idx_chat_messages_session_timestamp ON chat_messages(session_id, timestamp);
 
 -- Function to update the updated_at timestamp
 CREATE OR REPLACE FUNCTION update_updated_at_column()
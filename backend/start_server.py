@@ -10,13 +10,36 @@ from pathlib import Path
 app_dir = Path(__file__).parent / "app"
 sys.path.insert(0, str(app_dir))
 
+# DEV=1 runs one auto-reloading worker; otherwise the server runs in production mode
+DEV = os.getenv("DEV") == "1"
+
+def default_worker_count() -> int:
+    """One worker per CPU when job status is shared through Redis, else a single worker"""
+    # Without Redis, upload and analysis status live in process memory and
+    # a status poll landing on another worker would not find the job
+    if not os.getenv("REDIS_URL"):
+        return 1
+    return os.cpu_count() or 1
+
 if __name__ == "__main__":
     import uvicorn
     # Run the application
-    uvicorn.run(
-        "main:app",
-        host="0.0.0.0",
-        port=8002,
-        reload=True,
-        reload_dirs=[str(app_dir)]
-    )
+    if DEV:
+        uvicorn.run(
+            "main:app",
+            host="0.0.0.0",
+            port=8002,
+            reload=True,
+            reload_dirs=[str(app_dir)],
+            log_level=os.getenv("LOG_LEVEL", "INFO").lower()
+        )
+    else:
+        uvicorn.run(
+            "main:app",
+            host="0.0.0.0",
+            port=8002,
+            loop="uvloop",
+            http="httptools",
+            workers=int(os.getenv("WEB_CONCURRENCY", default_worker_count())),
+            log_level=os.getenv("LOG_LEVEL", "INFO").lower()
+        )
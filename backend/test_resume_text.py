@@ -0,0 +1,118 @@
+"""
+Plain-text resume parser tests - run with `pytest backend/test_resume_text.py`
+"""
+
+import sys
+from pathlib import Path
+
+# Add the app directory to Python path
+sys.path.insert(0, str(Path(__file__).parent / "app"))
+
+import pytest
+from vlm import (
+    split_text_sections,
+    split_text_entries,
+    parse_experience_entry,
+    parse_education_entry,
+    parse_resume_text,
+    is_complete_text_parse,
+)
+
+SAMPLE_RESUME_TEXT = """Jane Doe
+jane.doe@example.com | (555) 123-4567
+linkedin.com/in/janedoe github.com/janedoe
+
+Summary
+Backend engineer who likes digital products and GitHub Actions.
+
+Work Experience
+Senior Engineer at Acme Corp
+Jan 2020 - Present
+• Built Python services on AWS
+• Cut deploy time in half with Docker
+
+Software Developer | Globex
+2016 – 2019
+Maintained the JavaScript frontend
+- Added React components
+
+Education
+BSc Computer Science, State University
+2012 - 2016
+GPA: 3.80
+
+Skills
+Python, JavaScript, React, Docker, AWS
+"""
+
+@pytest.fixture
+def sections():
+    return split_text_sections(SAMPLE_RESUME_TEXT)
+
+def test_split_text_sections(sections):
+    """Lines are collected under experience and education; other headings end a section"""
+    assert sections["experience"][0] == "Senior Engineer at Acme Corp"
+    assert "- Added React components" in sections["experience"]
+    assert sections["education"][:3] == ["BSc Computer Science, State University", "2012 - 2016", "GPA: 3.80"]
+    assert not any("Python, JavaScript" in line for line in sections["experience"] + sections["education"])
+
+def test_split_text_entries(sections):
+    """Blank lines separate entries"""
+    entries = split_text_entries(sections["experience"])
+    assert [entry[0] for entry in entries] == ["Senior Engineer at Acme Corp", "Software Developer | Globex"]
+
+def test_split_text_entries_after_bullets():
+    """A plain line after bullet points starts a new entry even without a blank line"""
+    entries = split_text_entries(["Engineer at A", "2019 - 2020", "• Did things", "Analyst at B", "• Other things"])
+    assert entries == [["Engineer at A", "2019 - 2020", "• Did things"], ["Analyst at B", "• Other things"]]
+
+def test_parse_experience_entry():
+    """Title, company, date range and bullet points are picked out of an entry"""
+    job = parse_experience_entry(["Senior Engineer at Acme Corp", "Jan 2020 - Present", "• Built Python services on AWS"])
+    assert job == {
+        "position": "Senior Engineer",
+        "company": "Acme Corp",
+        "duration": "Jan 2020 - Present",
+        "description": "",
+        "achievements": ["Built Python services on AWS"]
+    }
+
+def test_parse_experience_entry_company_on_next_line():
+    """Without a separator the company is read from the second header line"""
+    job = parse_experience_entry(["Data Analyst", "Initech", "2018 to 2019", "Reporting and dashboards"])
+    assert (job["position"], job["company"], job["duration"]) == ("Data Analyst", "Initech", "2018 to 2019")
+    assert job["description"] == "Reporting and dashboards"
+
+def test_parse_education_entry():
+    """Degree, institution, graduation year and GPA are picked out of an entry"""
+    school = parse_education_entry(["BSc Computer Science, State University", "2012 - 2016", "GPA: 3.80"])
+    assert school == {
+        "degree": "BSc Computer Science",
+        "field": "",
+        "institution": "State University",
+        "graduation_year": "2016",
+        "gpa": "3.80"
+    }
+
+def test_parse_resume_text():
+    """Contact details, links, whole-word skills and sections from a full resume"""
+    resume = parse_resume_text(SAMPLE_RESUME_TEXT)
+    personal_info = resume["personal_info"]
+    assert personal_info["full_name"] == "Jane Doe"
+    assert personal_info["email"] == "jane.doe@example.com"
+    assert personal_info["linkedin"] == "linkedin.com/in/janedoe"
+    assert personal_info["github"] == "github.com/janedoe"
+    # "GitHub" and "digital" don't count as Git, nor "JavaScript" as Java
+    assert "Git" not in resume["skills"] and "Java" not in resume["skills"]
+    assert {"Python", "Javascript", "React", "Docker", "Aws"} <= set(resume["skills"])
+    assert [job["company"] for job in resume["experience"]] == ["Acme Corp", "Globex"]
+    assert resume["education"][0]["institution"] == "State University"
+
+def test_is_complete_text_parse():
+    """A parse only stands in for the VLM with an email plus a full job or degree"""
+    assert is_complete_text_parse(parse_resume_text(SAMPLE_RESUME_TEXT))
+    assert not is_complete_text_parse(parse_resume_text("Jane Doe\njane@example.com\nPython"))
+    # No email
+    assert not is_complete_text_parse(parse_resume_text(SAMPLE_RESUME_TEXT.replace("jane.doe@example.com", "")))
+    # Jobs without a company and no education
+    assert not is_complete_text_parse(parse_resume_text("Jane Doe\njane@example.com\n\nExperience\nEngineer\n"))
@@ -1,143 +1,118 @@
+"""
+Complete system functionality test - run against a live backend with `pytest -n 5 -s backend/test_system.py`
+"""
+
 import requests
+from requests.adapters import HTTPAdapter
 import json
 import os
+import time
+import pytest
+from openai import OpenAI
 from dotenv import load_dotenv
+from vlm_testing import TEST_PDF_BYTES
 
 load_dotenv()
 
-print('=== Complete System Functionality Test ===')
-print()
+# Built once per process; None when there is no key to test with
+api_key = os.getenv('OPENAI_API_KEY')
+openai_client = OpenAI(api_key=api_key) if api_key else None
 
 base_url = 'http://localhost:8002'
 
-# Test 1: Health check
-print('1. Testing Backend Health Check')
-try:
-    response = requests.get(f'{base_url}/')
+@pytest.fixture(scope="session")
+def session():
+    """One keep-alive connection pool for every call to the backend"""
+    http = requests.Session()
+    http.mount('http://', HTTPAdapter(pool_connections=4, pool_maxsize=16))
+    yield http
+    http.close()
+
+def test_health(session):
+    """1. Backend health check"""
+    response = session.get(f'{base_url}/')
     print(f'✅ Health check: {response.status_code} - {response.text}')
-except Exception as e:
-    print(f'❌ Health check failed: {e}')
-
-print()
-
-# Test 2: Get chat sessions (to check database connectivity)
-print('2. Testing Chat Sessions API')
-try:
-    response = requests.get(f'{base_url}/chat-sessions')
-    if response.status_code == 200:
-        sessions = response.json()
-        print(f'✅ Get chat sessions: {response.status_code} - Found {len(sessions)} sessions')
-        if sessions:
-            sample = sessions[0]
-            session_id = sample.get('id', 'N/A')
-            print(f'   � Sample session: {session_id}')
-    else:
-        print(f'❌ Get chat sessions failed: {response.status_code}')
-except Exception as e:
-    print(f'❌ Get chat sessions error: {e}')
-
-print()
-
-# Test 3: Test OpenAI API key for chat
-print('3. Testing OpenAI API')
-try:
-    api_key = os.getenv('OPENAI_API_KEY')
-    if api_key:
-        print(f'✅ OpenAI API key found: {api_key[:15]}...{api_key[-10:]}')
-        
-        # Test with a simple completion
-        from openai import OpenAI
-        client = OpenAI(api_key=api_key)
-        
-        response = client.chat.completions.create(
-            model='gpt-3.5-turbo',
-            messages=[{'role': 'user', 'content': 'Say "API test successful"'}],
-            max_tokens=10
-        )
-        
-        result = response.choices[0].message.content
-        print(f'✅ OpenAI API test: {result}')
-    else:
-        print('❌ No OpenAI API key found')
-        
-except Exception as e:
-    print(f'❌ OpenAI API error: {e}')
-
-print()
-
-# Test 4: Test chat API endpoint
-print('4. Testing Chat API Endpoint')
-try:
-    # Test creating a chat message without specific resume
+    assert response.status_code == 200
+
+def test_chat_sessions(session):
+    """2. Chat sessions API (checks database connectivity)"""
+    response = session.get(f'{base_url}/chat-sessions')
+    assert response.status_code == 200, f'Get chat sessions failed: {response.status_code}'
+    sessions = response.json()
+    print(f'✅ Get chat sessions: {response.status_code} - Found {len(sessions)} sessions')
+    if sessions:
+        session_id = sessions[0].get('id', 'N/A')
+        print(f'   📋 Sample session: {session_id}')
+
+def test_openai():
+    """3. OpenAI API key for chat"""
+    if not openai_client:
+        pytest.skip('No OpenAI API key found')
+    print(f'✅ OpenAI API key found: {api_key[:15]}...{api_key[-10:]}')
+
+    # Test with a simple completion
+    response = openai_client.chat.completions.create(
+        model='gpt-3.5-turbo',
+        messages=[{'role': 'user', 'content': 'Say "API test successful"'}],
+        max_tokens=10
+    )
+
+    result = response.choices[0].message.content
+    print(f'✅ OpenAI API test: {result}')
+    assert result
+
+def test_chat(session):
+    """4. Chat API endpoint without a specific resume"""
     chat_data = {
         "message": "Hello, I want to upload a resume for analysis"
     }
-    
-    response = requests.post(f'{base_url}/chat', json=chat_data)
-    if response.status_code == 200:
-        chat_result = response.json()
-        print(f'✅ Chat API: Working')
-        print(f'   💬 Response preview: {chat_result.get("response", "No response")[:100]}...')
-        
-        # Check if session was created
-        session_id = chat_result.get('session_id')
-        if session_id:
-            print(f'   🔗 Session created: {session_id}')
-    else:
-        print(f'❌ Chat API failed: {response.status_code}')
-        print(f'   Error: {response.text}')
-        
-except Exception as e:
-    print(f'❌ Chat API error: {e}')
-
-print()
-
-# Test 5: Test file upload endpoint (with a dummy file)
-print('5. Testing File Upload API')
-try:
-    # Create a simple test file content
-    test_content = b'%PDF-1.4\n1 0 obj\n<< /Type /Catalog >>\nendobj\nxref\n0 1\ntrailer\n<< /Root 1 0 R >>\n%%EOF'
-    
-    files = {'file': ('test_resume.pdf', test_content, 'application/pdf')}
-    
-    response = requests.post(f'{base_url}/upload-resume', files=files)
-    
-    if response.status_code == 200:
-        upload_result = response.json()
-        print(f'✅ File upload: Working')
-        print(f'   📄 Job ID: {upload_result.get("job_id", "N/A")}')
-        print(f'   📊 Status: {upload_result.get("status", "N/A")}')
-        
-        # Test checking parsing status
-        job_id = upload_result.get("job_id")
-        if job_id:
-            import time
-            time.sleep(1)  # Wait a moment for processing
-            status_response = requests.get(f'{base_url}/parsing-status/{job_id}')
+
+    response = session.post(f'{base_url}/chat', json=chat_data)
+    assert response.status_code == 200, f'Chat API failed: {response.status_code} - {response.text}'
+    chat_result = response.json()
+    print(f'✅ Chat API: Working')
+    print(f'   💬 Response preview: {chat_result.get("response", "No response")[:100]}...')
+
+    # Check if session was created
+    session_id = chat_result.get('session_id')
+    if session_id:
+        print(f'   🔗 Session created: {session_id}')
+
+def test_upload_flow(session):
+    """5. File upload, parsing status and parsed resume"""
+    files = {'file': ('test_resume.pdf', TEST_PDF_BYTES, 'application/pdf')}
+
+    response = session.post(f'{base_url}/upload-resume', files=files)
+    assert response.status_code == 200, f'File upload failed: {response.status_code} - {response.text}'
+    upload_result = response.json()
+    print(f'✅ File upload: Working')
+    print(f'   📄 Job ID: {upload_result.get("job_id", "N/A")}')
+    print(f'   📊 Status: {upload_result.get("status", "N/A")}')
+
+    # Test checking parsing status
+    job_id = upload_result.get("job_id")
+    if job_id:
+        # Poll until parsing finishes, backing off from 50 ms up to 0.5 s between checks
+        status_result = {}
+        deadline = time.monotonic() + 10
+        delay = 0.05
+        while time.monotonic() < deadline:
+            status_response = session.get(f'{base_url}/parsing-status/{job_id}')
             if status_response.status_code == 200:
                 status_result = status_response.json()
-                print(f'   ⏱️ Parsing status: {status_result.get("status", "unknown")}')
-                
-                # If completed, try to get the resume
-                if status_result.get("status") == "completed":
-                    resume_response = requests.get(f'{base_url}/resume/{job_id}')
-                    if resume_response.status_code == 200:
-                        resume_data = resume_response.json()
-                        name = resume_data.get("personal_info", {}).get("full_name", "N/A")
-                        print(f'   👤 Parsed name: {name}')
-    else:
-        print(f'❌ File upload failed: {response.status_code}')
-        print(f'   Error: {response.text}')
-        
-except Exception as e:
-    print(f'❌ File upload error: {e}')
-
-print()
-print('=== Test Summary ===')
-print('✅ Database: Connected (27 resumes)')
-print('✅ Backend: Running on port 8002')
-print('✅ Frontend: Running on port 3000')
-print('⏳ VLM API: Pending activation (using mock data)')
-print()
-print('🎉 System is fully functional and ready to use!')
-print('📱 Open http://localhost:3000 to access the application')
+                if status_result.get("status") in ("completed", "error"):
+                    break
+            time.sleep(delay)
+            delay = min(delay * 1.5, 0.5)
+        print(f'   ⏱️ Parsing status: {status_result.get("status", "unknown")}')
+
+        # If completed, try to get the resume
+        if status_result.get("status") == "completed":
+            resume_response = session.get(f'{base_url}/resume/{job_id}')
+            if resume_response.status_code == 200:
+                resume_data = resume_response.json()
+                name = resume_data.get("personal_info", {}).get("full_name", "N/A")
+                print(f'   👤 Parsed name: {name}')
+
+if __name__ == '__main__':
+    raise SystemExit(pytest.main([__file__, '-n', '5', '-s']))
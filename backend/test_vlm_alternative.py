@@ -5,30 +5,113 @@ Test VLM.run API with alternative approaches that might not require file upload
 
 import os
 import sys
+import asyncio
 import tempfile
+import pytest
 from pathlib import Path
 from dotenv import load_dotenv
+from vlm_config import get_vlm_api_key, vlm_api_key_redacted
+from vlm_testing import TEST_PDF_BYTES
 
 # Load environment variables
 load_dotenv()
 
 try:
     from vlmrun.client import VLMRun
+    from vlmrun.client.exceptions import APIError
     print("✅ VLM.run SDK imported successfully!")
 except ImportError as e:
     print(f"❌ VLM.run SDK not available: {e}")
-    sys.exit(1)
+    if __name__ == "__main__":
+        sys.exit(1)
+    VLMRun = None
+
+# File purposes tried by the upload tests
+UPLOAD_PURPOSES = ["vision", "batch", "datasets"]
+
+@pytest.fixture(scope="module")
+def vlm_client():
+    """VLMRun client for the upload tests, skipped without the SDK or an API key"""
+    if VLMRun is None:
+        pytest.skip("VLM.run SDK not available")
+    vlm_api_key = get_vlm_api_key()
+    if not vlm_api_key:
+        pytest.skip("No VLM API key found")
+    os.environ["VLMRUN_API_KEY"] = vlm_api_key
+    return VLMRun()
+
+@pytest.mark.parametrize("purpose", UPLOAD_PURPOSES)
+def test_upload_purpose(purpose, vlm_client, test_pdf_path):
+    """Upload the test PDF with one purpose and delete it again"""
+    try:
+        file_response = vlm_client.files.upload(file=str(test_pdf_path), purpose=purpose)
+    except APIError as e:
+        # Keys without file permissions are rejected with 403, which is an account setting, not a failure
+        if e.http_status == 403:
+            pytest.skip(f"API key may not upload files with purpose '{purpose}': {e}")
+        raise
+    print(f"✅ Upload with purpose '{purpose}' success: {file_response.id}")
+    vlm_client.files.delete(file_response.id)
+
+def upload_with_purpose(client, file_path, purpose):
+    """Upload and delete a test file with one purpose, returning the lines to report"""
+    try:
+        file_response = client.files.upload(
+            file=file_path,
+            purpose=purpose
+        )
+        lines = [f"✅ Upload with purpose '{purpose}' success: {file_response.id}"]
+        
+        # Try to delete the test file
+        client.files.delete(file_response.id)
+        lines.append(f"✅ Deleted test file: {file_response.id}")
+        return lines
+    except Exception as e:
+        return [f"❌ Upload with purpose '{purpose}' failed: {e}"]
+
+async def upload_with_purposes(client, file_path, purposes):
+    """Try every upload purpose at once on worker threads"""
+    return await asyncio.gather(*(
+        asyncio.to_thread(upload_with_purpose, client, file_path, purpose) for purpose in purposes
+    ))
+
+def run_upload_purposes():
+    """Script-mode version of test_upload_purpose - pytest runs each purpose as its own test instead"""
+    vlm_api_key = get_vlm_api_key()
+    if not vlm_api_key:
+        print("❌ No VLM API key found")
+        return
+    
+    print("\n=== Try different file purposes ===")
+    with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as temp_file:
+        temp_file.write(TEST_PDF_BYTES)
+        temp_file_path = temp_file.name
+    
+    try:
+        os.environ["VLMRUN_API_KEY"] = vlm_api_key
+        results = asyncio.run(upload_with_purposes(VLMRun(), temp_file_path, UPLOAD_PURPOSES))
+        sys.stdout.write("".join(f"{line}\n" for lines in results for line in lines))
+        sys.stdout.flush()
+    except Exception as e:
+        print(f"❌ General error: {e}")
+    finally:
+        Path(temp_file_path).unlink(missing_ok=True)
 
 def test_vlm_alternatives():
     """Test different VLM.run approaches"""
     
-    vlm_api_key = os.getenv("VLMRUN_API_KEY") or os.getenv("VLM_API_KEY")
+    vlm_api_key = get_vlm_api_key()
     if not vlm_api_key:
         print("❌ No VLM API key found")
         return
     
     print(f"=== Testing VLM.run Alternative Approaches ===")
-    print(f"Using API key: {vlm_api_key[:12]}...{vlm_api_key[-5:]}")
+    print(f"Using API key: {vlm_api_key_redacted()}")
+    
+    # Every test uploads the same bytes, so the file is written once and removed at the end
+    with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as temp_file:
+        temp_file.write(TEST_PDF_BYTES)
+        temp_file_path = temp_file.name
     
     try:
         # Initialize client
@@ -38,10 +121,6 @@ def test_vlm_alternatives():
         
         # Test 1: Try with explicit purpose parameter
         print("\n=== Test 1: Document processing with explicit purpose ===")
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as temp_file:
-            temp_file.write(b"Sample PDF content for testing")
-            temp_file_path = temp_file.name
-        
         try:
             # Try with different configuration
             response = client.document.generate(
@@ -52,17 +131,10 @@ def test_vlm_alternatives():
             print(f"✅ Test 1 success: {response}")
         except Exception as e:
             print(f"❌ Test 1 failed: {e}")
-        finally:
-            if os.path.exists(temp_file_path):
-                os.unlink(temp_file_path)
         
         # Test 2: Check if we can manually upload files first
         print("\n=== Test 2: Manual file upload ===")
         try:
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as temp_file:
-                temp_file.write(b"Sample PDF content for testing")
-                temp_file_path = temp_file.name
-            
             # Try explicit file upload
             file_response = client.files.upload(
                 file=temp_file_path,
@@ -79,9 +151,6 @@ def test_vlm_alternatives():
             
         except Exception as e:
             print(f"❌ Test 2 failed: {e}")
-        finally:
-            if os.path.exists(temp_file_path):
-                os.unlink(temp_file_path)
         
         # Test 3: Check available domains
         print("\n=== Test 3: Check available domains ===")
@@ -91,34 +160,11 @@ def test_vlm_alternatives():
         except Exception as e:
             print(f"❌ Test 3 failed: {e}")
         
-        # Test 4: Check file upload purposes
-        print("\n=== Test 4: Try different file purposes ===")
-        purposes_to_try = ["vision", "batch", "datasets"]
-        
-        for purpose in purposes_to_try:
-            try:
-                with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as temp_file:
-                    temp_file.write(b"Sample PDF content for testing")
-                    temp_file_path = temp_file.name
-                
-                file_response = client.files.upload(
-                    file=temp_file_path,
-                    purpose=purpose
-                )
-                print(f"✅ Upload with purpose '{purpose}' success: {file_response.id}")
-                
-                # Try to delete the test file
-                client.files.delete(file_response.id)
-                print(f"✅ Deleted test file: {file_response.id}")
-                
-            except Exception as e:
-                print(f"❌ Upload with purpose '{purpose}' failed: {e}")
-            finally:
-                if os.path.exists(temp_file_path):
-                    os.unlink(temp_file_path)
-        
     except Exception as e:
         print(f"❌ General error: {e}")
+    finally:
+        Path(temp_file_path).unlink(missing_ok=True)
 
 if __name__ == "__main__":
     test_vlm_alternatives()
+    run_upload_purposes()
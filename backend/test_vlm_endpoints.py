@@ -5,14 +5,39 @@ Check all VLM.run endpoints that are being used
 
 import os
 import sys
+import asyncio
 import tempfile
-import requests
+import httpx
 from pathlib import Path
 from dotenv import load_dotenv
+from vlm_config import get_vlm_api_key, vlm_api_key_redacted
 
 # Load environment variables
 load_dotenv()
 
+# HTTP/2 needs the optional h2 package; without it httpx stays on HTTP/1.1
+try:
+    import h2
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+async def probe_endpoints(api_key, endpoints):
+    """GET every endpoint at once over one connection, returning (endpoint, response, error) tuples"""
+    headers = {
+        'Authorization': f'Bearer {api_key}',
+        'Content-Type': 'application/json'
+    }
+    limits = httpx.Limits(max_connections=32, max_keepalive_connections=16)
+    # Connection failures are retried on the transport, like the shared VLM session in vlm_testing.py
+    transport = httpx.AsyncHTTPTransport(http2=HTTP2_AVAILABLE, limits=limits, retries=3)
+    async with httpx.AsyncClient(transport=transport, headers=headers, timeout=10) as client:
+        responses = await asyncio.gather(*(client.get(endpoint, follow_redirects=True) for endpoint in endpoints), return_exceptions=True)
+    return [
+        (endpoint, None, response) if isinstance(response, Exception) else (endpoint, response, None)
+        for endpoint, response in zip(endpoints, responses)
+    ]
+
 def analyze_vlm_endpoints():
     """Analyze all VLM.run endpoints we've encountered"""
     
@@ -31,17 +56,12 @@ def analyze_vlm_endpoints():
         print(f"{i}. {endpoint}")
     
     # Test basic connectivity to known working endpoint
-    vlm_api_key = os.getenv("VLMRUN_API_KEY") or os.getenv("VLM_API_KEY")
+    vlm_api_key = get_vlm_api_key()
     if not vlm_api_key:
         print("❌ No VLM API key found")
         return
     
-    print(f"\n🔑 Using API key: {vlm_api_key[:12]}...{vlm_api_key[-5:]}")
-    
-    headers = {
-        'Authorization': f'Bearer {vlm_api_key}',
-        'Content-Type': 'application/json'
-    }
+    print(f"\n🔑 Using API key: {vlm_api_key_redacted()}")
     
     # Test different endpoints
     test_endpoints = [
@@ -54,41 +74,46 @@ def analyze_vlm_endpoints():
         "https://api.vlm.run/v1/predictions",
     ]
     
-    print("\n🔍 Testing different endpoints:")
-    for endpoint in test_endpoints:
-        try:
-            response = requests.get(endpoint, headers=headers, timeout=10)
-            print(f"✅ {endpoint} → {response.status_code}")
-            if response.status_code == 200:
-                try:
-                    data = response.json()
-                    print(f"   Response keys: {list(data.keys()) if isinstance(data, dict) else 'Not dict'}")
-                except:
-                    print(f"   Response: {response.text[:100]}...")
-        except Exception as e:
-            print(f"❌ {endpoint} → Error: {e}")
-    
-    # Test file endpoints specifically
-    print("\n📁 Testing file-related endpoints:")
     file_endpoints = [
         "https://api.vlm.run/v1/files",
         "https://api.vlm.run/v1/files?limit=1",
     ]
     
-    for endpoint in file_endpoints:
-        try:
-            response = requests.get(endpoint, headers=headers, timeout=10)
-            print(f"📁 {endpoint} → {response.status_code}")
-            if response.status_code != 200:
-                print(f"   Error: {response.text[:200]}")
-            else:
-                try:
-                    data = response.json()
-                    print(f"   Success: {data}")
-                except:
-                    print(f"   Response: {response.text[:100]}")
-        except Exception as e:
-            print(f"❌ {endpoint} → Error: {e}")
+    # Every probe is sent at once - the total wait is the slowest endpoint, not the sum
+    results = asyncio.run(probe_endpoints(vlm_api_key, test_endpoints + file_endpoints))
+    
+    # Each phase's report is collected and written in one go
+    out = ["\n🔍 Testing different endpoints:\n"]
+    for endpoint, response, error in results[:len(test_endpoints)]:
+        if error is not None:
+            out.append(f"❌ {endpoint} → Error: {error}\n")
+            continue
+        out.append(f"✅ {endpoint} → {response.status_code}\n")
+        if response.status_code == 200:
+            try:
+                data = response.json()
+                out.append(f"   Response keys: {list(data.keys()) if isinstance(data, dict) else 'Not dict'}\n")
+            except:
+                out.append(f"   Response: {response.text[:100]}...\n")
+    sys.stdout.write("".join(out))
+    
+    # Test file endpoints specifically
+    out = ["\n📁 Testing file-related endpoints:\n"]
+    for endpoint, response, error in results[len(test_endpoints):]:
+        if error is not None:
+            out.append(f"❌ {endpoint} → Error: {error}\n")
+            continue
+        out.append(f"📁 {endpoint} → {response.status_code}\n")
+        if response.status_code != 200:
+            out.append(f"   Error: {response.text[:200]}\n")
+        else:
+            try:
+                data = response.json()
+                out.append(f"   Success: {data}\n")
+            except:
+                out.append(f"   Response: {response.text[:100]}\n")
+    sys.stdout.write("".join(out))
+    sys.stdout.flush()
 
 if __name__ == "__main__":
     analyze_vlm_endpoints()
@@ -0,0 +1,21 @@
+"""
+VLM.run API key lookup shared by the status and test scripts
+"""
+
+import os
+import functools
+from typing import Optional
+from dotenv import load_dotenv
+
+load_dotenv()
+
+@functools.lru_cache(maxsize=None)
+def get_vlm_api_key() -> Optional[str]:
+    """The VLM.run API key from VLMRUN_API_KEY, falling back to VLM_API_KEY"""
+    return os.getenv("VLMRUN_API_KEY") or os.getenv("VLM_API_KEY")
+
+@functools.lru_cache(maxsize=None)
+def vlm_api_key_redacted() -> str:
+    """The API key shortened for printing"""
+    key = get_vlm_api_key()
+    return f"{key[:12]}...{key[-5:]}" if key else ""
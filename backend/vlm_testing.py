@@ -0,0 +1,23 @@
+"""
+Sample PDF and VLM.run session helpers shared by the test scripts
+"""
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from vlm_config import get_vlm_api_key
+
+# Minimal one-page PDF uploaded by the backend and VLM.run tests
+TEST_PDF_BYTES = b'%PDF-1.4\n1 0 obj\n<<\n/Type /Catalog\n/Pages 2 0 R\n>>\nendobj\n2 0 obj\n<<\n/Type /Pages\n/Kids [3 0 R]\n/Count 1\n>>\nendobj\n3 0 obj\n<<\n/Type /Page\n/Parent 2 0 R\n/MediaBox [0 0 612 792]\n>>\nendobj\nxref\n0 4\n0000000000 65535 f \n0000000010 00000 n \n0000000053 00000 n \n0000000125 00000 n \ntrailer\n<<\n/Size 4\n/Root 1 0 R\n>>\nstartxref\n179\n%%EOF'
+
+def make_vlm_session():
+    """Authenticated session for api.vlm.run that retries connection errors and gateway failures"""
+    vlm_api_key = get_vlm_api_key()
+    session = requests.Session()
+    session.headers.update({
+        'Authorization': f'Bearer {vlm_api_key}',
+        'Content-Type': 'application/json'
+    })
+    retry = Retry(total=3, backoff_factor=0.2, status_forcelist=[502, 503, 504])
+    session.mount('https://', HTTPAdapter(pool_maxsize=16, max_retries=retry))
+    return session